@@ -1,26 +1,349 @@
 import json
-import re
+import mmap
 import argparse
+import glob
+import os
+import sys
+from contextlib import nullcontext
+
+from actions import DEFAULT_ACTION_CATALOG, catalog_findings, load_action_catalog
+from instrumentation import Instrumentation, profiling
+from profiles import DEFAULT_CONFIG, WILDCARD_ERROR, WILDCARD_IGNORE, RuleProfile, load_profile
+from resources import BROAD, load_resource_patterns, pattern_findings, statement_breadth
+from reporting import ERROR, WARNING, Diagnostic
+from rules import RuleContext, RuleRegistry
+
+try:
+    # Optional faster decoder, used when installed
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump whenever a rule changes, cached results of older rulesets are then ignored
+RULESET_VERSION = "7"
+
+# Effect values according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_effect.html
+VALID_EFFECTS = ("Allow", "Deny")
+
+
+def decode_json(buffer):
+    """
+        Decode JSON from str, bytes, bytearray, memoryview or mmap.
+        orjson reads the buffer directly when installed, the standard json module
+        needs one copy for memoryview and mmap buffers. Raises ValueError on invalid JSON.
+    """
+    if orjson is not None:
+        if isinstance(buffer, mmap.mmap):
+            with memoryview(buffer) as view:
+                return orjson.loads(view)
+        return orjson.loads(buffer)
+    if isinstance(buffer, (memoryview, mmap.mmap)):
+        buffer = bytes(buffer)
+    return json.loads(buffer)
+
+
+class ValidationResult:
+    """
+        Findings collected by a single pass of VeryfingIfValidJSON.validate().
+        'diagnostics' holds every finding as a Diagnostic (rule, severity, JSON pointer, message),
+        'errors' and 'warnings' keep their messages in the same order main() used to report them,
+        'resource' is the resource check result (False when any statement uses "*").
+    """
+
+    def __init__(self) -> None:
+        self.diagnostics = []
+        self.errors = []
+        self.warnings = []
+        self.resource = None
+
+    @classmethod
+    def from_load_error(cls, message):
+        """
+            Result of a policy that could not be loaded or parsed.
+        """
+        result = cls()
+        result.add(Diagnostic("load", ERROR, "", message))
+        return result
+
+    def add(self, diagnostic):
+        self.diagnostics.append(diagnostic)
+        if diagnostic.severity == ERROR:
+            self.errors.append(diagnostic.message)
+        else:
+            self.warnings.append(diagnostic.message)
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def to_dict(self):
+        """
+            Plain dictionary form used for machine-readable output.
+        """
+        return {
+            "valid": self.valid,
+            "resource": self.resource if self.valid else None,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "diagnostics": [diagnostic.to_dict() for diagnostic in self.diagnostics],
+        }
+
+
+def _as_list(value):
+    if value is None or isinstance(value, list):
+        return value
+    return [value]
+
+
+class StatementColumns:
+    """
+        Statements of a PolicyDocument normalized into parallel lists, index i of every list describes statement i.
+        A single statement object is treated as a list of one. Missing keys are stored as None and
+        Action/NotAction/Resource/NotResource values are always lists.
+    """
+
+    def __init__(self, statement) -> None:
+        statements = statement if isinstance(statement, list) else [statement]
+        # A single statement object is addressed as /PolicyDocument/Statement, list items by index
+        self.is_list = isinstance(statement, list)
+        self.objects = []
+        self.sids = []
+        self.effects = []
+        self.actions = []
+        self.not_actions = []
+        self.resources = []
+        self.not_resources = []
+        self.conditions = []
+
+        for item in statements:
+            is_object = isinstance(item, dict)
+            if not is_object:
+                item = {}
+            self.objects.append(is_object)
+            self.sids.append(item.get('Sid'))
+            self.effects.append(item.get('Effect'))
+            self.actions.append(_as_list(item.get('Action')))
+            self.not_actions.append(_as_list(item.get('NotAction')))
+            self.resources.append(_as_list(item.get('Resource')))
+            self.not_resources.append(_as_list(item.get('NotResource')))
+            self.conditions.append(item.get('Condition'))
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+
+# Statement rules, each one is evaluated over all statements at once and returns (statement index, message) findings
+def sid_findings(columns, profile):
+    findings = []
+    for index, (is_object, sid) in enumerate(zip(columns.objects, columns.sids)):
+        if sid is None:
+            if is_object and profile.sid_required:
+                findings.append((index, "Sid is required in Statement"))
+        elif not profile.valid_sid(sid):
+            findings.append((index, profile.sid_message))
+    return findings
+
+
+def effect_findings(columns):
+    findings = []
+    for index, (is_object, effect) in enumerate(zip(columns.objects, columns.effects)):
+        if not is_object:
+            findings.append((index, "Statement must be an object"))
+        elif effect is None:
+            findings.append((index, 'Effect not in JSON'))
+        elif effect not in VALID_EFFECTS:
+            findings.append((index, "Valid values for Effect are only: Allow and Deny"))
+    return findings
+
+
+def action_findings(columns):
+    return [(index, "Action or NotAction must be included in Statement")
+            for index, (is_object, action, not_action) in enumerate(zip(columns.objects, columns.actions, columns.not_actions))
+            if is_object and action is None and not_action is None]
+
+
+def resource_findings(columns):
+    return [(index, "Resource or NotResource must be included in Statement")
+            for index, (is_object, resource, not_resource) in enumerate(zip(columns.objects, columns.resources, columns.not_resources))
+            if is_object and resource is None and not_resource is None]
+
+
+def wildcard_findings(columns):
+    """
+        Statements granting a global or service-wide resource wildcard
+        ("*", "arn:aws:*:*:*:*", "arn:aws:s3:::*", an Allow with NotResource, ...).
+    """
+    return [(index, "Resource must not be a global or service-wide wildcard")
+            for index, (effect, resources, not_resources) in enumerate(zip(columns.effects, columns.resources, columns.not_resources))
+            if statement_breadth(effect, resources, not_resources) in BROAD]
+
+
+def has_wildcard_resource(columns):
+    return bool(wildcard_findings(columns))
+
+
+def _profile(context):
+    profile = context.options.get("profile")
+    if isinstance(profile, RuleProfile):
+        return profile
+    return load_profile(profile, context.options.get("config"))
+
+
+def _raise_first(findings):
+    if findings:
+        raise Exception(findings[0][1])
+
+
+# Built-in rules, every rule runs once per policy in dependency order (see rules.py)
+RULES = RuleRegistry()
+
+
+@RULES.rule("policy_document", reads=("PolicyName", "PolicyDocument"), path="")
+def _policy_document_rule(context):
+    data = context.data
+    if not isinstance(data, dict) or "PolicyName" not in data or "PolicyDocument" not in data:
+        return [(None, "PolicyName or PolicyDocument not found in JSON")]
+    if not isinstance(data["PolicyDocument"], dict):
+        return [(None, "PolicyDocument is not in JSON")]
+    context.document = data["PolicyDocument"]
+    return []
+
+
+@RULES.rule("policy_name", depends_on=("policy_document",), reads=("PolicyName",), path="/PolicyName")
+def _policy_name_rule(context):
+    policy_name = context.data["PolicyName"]
+    if not isinstance(policy_name, str):
+        return [(None, "PolicyName must be a string")]
+    if not _profile(context).valid_policy_name(policy_name):
+        return [(None, "PolicyName is not string or it requirements not met")]
+    return []
+
+
+@RULES.rule("version", depends_on=("policy_document",), reads=("Version",), path="/PolicyDocument/Version")
+def _version_rule(context):
+    if 'Version' not in context.document:
+        return [(None, 'Version not in Policy Document')]
+    return []
+
+
+@RULES.rule("statement", depends_on=("policy_document",), reads=("Statement",), path="/PolicyDocument/Statement")
+def _statement_rule(context):
+    if 'Statement' not in context.document:
+        return [(None, 'Statement not in Policy Document')]
+    context.columns = StatementColumns(context.document['Statement'])
+    return []
+
+
+RULES.register("sid", lambda context: sid_findings(context.columns, _profile(context)), ("statement",), ("Sid",))
+RULES.register("effect", lambda context: effect_findings(context.columns), ("statement",), ("Effect",))
+RULES.register("action", lambda context: action_findings(context.columns), ("statement",), ("Action", "NotAction"))
+RULES.register("resource", lambda context: resource_findings(context.columns), ("statement",), ("Resource", "NotResource"))
+
+
+@RULES.rule("resource_patterns", depends_on=("statement",), reads=("Resource",))
+def _resource_patterns_rule(context):
+    patterns = context.options.get("resource_patterns")
+    if patterns is None:
+        return []
+    if isinstance(patterns, str):
+        patterns = load_resource_patterns(patterns)
+    return pattern_findings(context.columns, patterns)
+
+
+@RULES.rule("action_catalog", depends_on=("statement",), reads=("Action", "NotAction", "Effect"))
+def _action_catalog_rule(context):
+    catalog = context.options.get("action_catalog")
+    if catalog is None:
+        return []
+    if isinstance(catalog, str):
+        catalog = load_action_catalog(catalog)
+    errors, warnings = catalog_findings(context.columns, catalog)
+    return errors + [(index, message, WARNING) for index, message in warnings]
+
+
+@RULES.rule("wildcard_resource", depends_on=("statement",), reads=("Resource", "NotResource", "Effect"))
+def _wildcard_resource_rule(context):
+    profile = _profile(context)
+    if profile.wildcard_resource == WILDCARD_IGNORE:
+        context.result.resource = True
+        return []
+    findings = wildcard_findings(context.columns)
+    context.result.resource = not findings
+    return findings if profile.wildcard_resource == WILDCARD_ERROR else []
+
 
 class VeryfingIfValidJSON:
 
     def __init__(self,path) -> None:
         self.path = path
         self.json_data = None
+        # Optional Instrumentation collecting phase and rule timings
+        self.instrumentation = None
+        # RuleProfile or profile name of config.json used by the check_* methods, None for the default profile
+        self.profile = None
+
+    @classmethod
+    def from_data(cls, data, path="<memory>"):
+        """
+            Create a verifier for an already parsed policy, no file is read.
+        """
+        verifier = cls(path)
+        verifier.json_data = data
+        return verifier
+
+    @classmethod
+    def from_bytes(cls, buffer, path="<memory>"):
+        """
+            Create a verifier for a policy held in a str, bytes, bytearray, memoryview or mmap buffer.
+        """
+        verifier = cls(path)
+        verifier.loading_buffer(buffer)
+        return verifier
+
+    @classmethod
+    def from_mmap(cls, path):
+        """
+            Create a verifier for a policy file decoded straight from a memory-mapped view of the file.
+        """
+        verifier = cls(path)
+        try:
+            with open(path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    raise Exception("JSON is not valid format")
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    verifier.loading_buffer(view)
+        except (FileNotFoundError):
+            raise Exception("File loading error")
+        return verifier
+
+    def loading_buffer(self, buffer):
+        """
+            Load JSON data from an in-memory buffer and check that the JSON format is correct.
+        """
+        try:
+            if self.instrumentation is None:
+                self.json_data = decode_json(buffer)
+            else:
+                with self.instrumentation.time("parse"):
+                    self.json_data = decode_json(buffer)
+        except ValueError:
+            # If JSON is not valid format, raise an exception
+            raise Exception("JSON is not valid format")
 
     def loading_file(self):
         """
             Load the file and check that the file has been loaded and that the JSON format is correct.
         """
         try:
-            # Attempt to open the file in read mode with UTF-8 encoding
-            with open(self.path,'r',encoding='UTF-8') as file:
-                try:
-                    # Attempt to load JSON data from the file
-                    self.json_data = json.load(file)     
-                except ValueError as err:
-                    # If JSON is not valid format, raise an exception
-                    raise Exception("JSON is not valid format")
+            # Attempt to open the file in binary mode, the decoder handles UTF-8
+            with open(self.path,'rb') as file:
+                if self.instrumentation is None:
+                    buffer = file.read()
+                else:
+                    with self.instrumentation.time("load"):
+                        buffer = file.read()
+            # Attempt to load JSON data from the file
+            self.loading_buffer(buffer)
 
         except (FileNotFoundError): 
             # If the file is not found, raise an exception
@@ -50,10 +373,8 @@ class VeryfingIfValidJSON:
         if not isinstance(policy_name, str):
             raise Exception("PolicyName must be a string")
         
-        # Setting pattern accoording to requirements
-        pattern = r'[\w+=,.@-]+'
-        match = re.fullmatch(pattern, policy_name)
-        if not match or not (len(policy_name) >= 1 or not len(policy_name) <= 128):
+        # Matching the precompiled pattern and length bounds of the rule profile
+        if not self.rule_profile().valid_policy_name(policy_name):
             # If 'PolicyName' if it does not meet the requirements
             raise Exception("PolicyName is not string or it requirements not met")
         
@@ -84,6 +405,12 @@ class VeryfingIfValidJSON:
             raise Exception('Statement not in Policy Document')
 
 
+    def statement_columns(self):
+        """
+            Return the 'Statement' element of the 'PolicyDocument' as StatementColumns.
+        """
+        return StatementColumns(self.json_data['PolicyDocument']['Statement'])
+
     # Sid check
     def check_validate_sid(self):
         """
@@ -93,98 +420,190 @@ class VeryfingIfValidJSON:
         self.check_required_policy_properties()
         self.check_validate_statement()
 
-        # Define pattern for 'Sid' validation according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_sid.html
-        sid_pattern =re.compile(r'^[A-Za-z0-9]+$')
-
-        # Check if 'Statement' is a list (multiple statements)
-        if isinstance(self.json_data['PolicyDocument']['Statement'], list):
-            # Iterate over each statement in the list
-            for statement in self.json_data['PolicyDocument']['Statement']:
-                if "Sid" in statement:
-                    sid = statement['Sid']
-                    # Validate 'Sid' format
-                    if not sid_pattern.match(sid):
-                        raise Exception("Invalid SID: The Sid element supports ASCII uppercase letters (A-Z), lowercase letters (a-z), and numbers (0-9)")
-        else:
-            # If 'Statement' is not a list (single statement), directly access it
-            statement = self.json_data['PolicyDocument']['Statement']
-            if "Sid" in statement:
-                sid = statement['Sid']
-                # Validate 'Sid' format
-                if sid_pattern.match(sid) is None:
-                    raise Exception("Invalid SID: The Sid element supports ASCII uppercase letters (A-Z), lowercase letters (a-z), and numbers (0-9)")
+        # Validate 'Sid' format of every statement, a single statement object is handled the same way
+        _raise_first(sid_findings(self.statement_columns(), self.rule_profile()))
 
     # Effect check
     # Effect is required according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_effect.html
     def check_validate_effect(self):
         """
-            Check if the 'Effect' key in the first 'Statement' element is valid according to AWS IAM specifications.
+            Check if the 'Effect' key of every 'Statement' element is valid according to AWS IAM specifications.
         """
         self.check_required_policy_properties()
         self.check_validate_statement()
 
-        # Check if 'Effect' is present in the first 'Statement' element
-        if 'Effect' in self.json_data['PolicyDocument']['Statement'][0]:
-            effect = self.json_data['PolicyDocument']['Statement'][0]['Effect']
-            # Validate 'Effect' value
-            if effect != ("Allow" or "Deny"):
-                raise Exception("Valid values for Effect are only: Allow and Deny")
-        else:
-            # If 'Effect' is not present in the first 'Statement' element, raise an exception
-            raise Exception('Effect not in JSON')
+        # 'Effect' must be present in every statement and be either "Allow" or "Deny"
+        _raise_first(effect_findings(self.statement_columns()))
     
     # Action check
     # Action is required according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_action.html
     def check_validate_action(self):
         """
-            Check if the 'Action' or 'NotAction' keys are included in the first 'Statement' element,
+            Check if the 'Action' or 'NotAction' keys are included in every 'Statement' element,
             as required by AWS IAM specifications.
         """
         self.check_required_policy_properties()
         self.check_validate_statement()
 
-        # Check if 'Action' or 'NotAction' is included in the first 'Statement' element
-        if 'Action' not in self.json_data['PolicyDocument']['Statement'][0] and 'NotAction' not in self.json_data['PolicyDocument']['Statement'][0]:
-            raise Exception("Action or NotAction must be included in Statement")
+        _raise_first(action_findings(self.statement_columns()))
     
     # Resource check
     # Resource is required according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_resource.html
     def check_validate_resource(self):
         """
-            Check if the 'Resource' or 'NotResource' keys are included in the first 'Statement' element,
+            Check if the 'Resource' or 'NotResource' keys are included in every 'Statement' element,
             as required by AWS IAM specifications.
+            Returns False if any statement grants a global or service-wide resource wildcard, True otherwise.
         """
         self.check_required_policy_properties()
         self.check_validate_statement()
 
-        # Check if 'Resource' or 'NotResource' is included in the first 'Statement' element
-        if 'Resource' in self.json_data['PolicyDocument']['Statement'][0] or 'NotResource' in self.json_data['PolicyDocument']['Statement'][0]:
-            resource = self.json_data['PolicyDocument']['Statement'][0]['Resource']
-            # Check if 'Resource' is not set to "*"
-            if resource == "*":
-                return False
-            else:
-                return True
-        else:
-            raise Exception("Resource or NotResource must be included in Statement")
+        columns = self.statement_columns()
+        _raise_first(resource_findings(columns))
+        profile = self.rule_profile()
+        if profile.wildcard_resource == WILDCARD_IGNORE:
+            return True
+        if profile.wildcard_resource == WILDCARD_ERROR:
+            _raise_first(wildcard_findings(columns))
+        return not has_wildcard_resource(columns)
+
+    def rule_profile(self):
+        if isinstance(self.profile, RuleProfile):
+            return self.profile
+        return load_profile(self.profile)
+
+    def validate(self, resource_patterns=None, action_catalog=None, rules=None, executor=None, profile=None, config=None):
+        """
+            Walk the loaded JSON data once and check every rule against every statement.
+            Unlike the check_validate_* methods nothing is re-checked and nothing is raised,
+            all findings are collected in the returned ValidationResult.
+            'resource_patterns' is a ResourcePatterns object or the path of its JSON file,
+            every 'Resource' is then also checked against the allow/deny patterns.
+            'action_catalog' is an ActionCatalog object or the path of its JSON file,
+            every 'Action' and 'NotAction' is then checked against the catalog.
+            'rules' is the RuleRegistry to run (default RULES), with an 'executor'
+            independent rules run concurrently.
+            'profile' is a RuleProfile or the name of a profile of the 'config' file
+            (default: the default profile of the shipped config.json).
+        """
+        options = {"resource_patterns": resource_patterns, "action_catalog": action_catalog,
+                   "profile": profile if profile is not None else self.profile, "config": config}
+        if self.instrumentation is None:
+            return self._validate(options, rules, executor)
+        with self.instrumentation.time("validate"):
+            result = self._validate(options, rules, executor)
+        self.instrumentation.count("policies")
+        self.instrumentation.count("errors", len(result.errors))
+        return result
 
-    def main(self):
+    def _validate(self, options, rules, executor):
+        context = RuleContext(self.json_data, ValidationResult(), options, self.instrumentation)
+        return (rules or RULES).plan().run(context, executor)
+
+    def main(self, **options):
         try:
             self.loading_file()
-            self.check_required_policy_properties()
-            self.check_validate_version()
-            self.check_validate_statement()
-            self.check_validate_sid()
-            self.check_validate_effect()
-            self.check_validate_action()
-            return self.check_validate_resource()
         except Exception as error:
             print(f"Error: {error}")
+            return None
+
+        result = self.validate(**options)
+        if result.errors:
+            print(f"Error: {result.errors[0]}")
+            return None
+        return result.resource
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Verify if a JSON file contains a valid IAM policy.")
-    parser.add_argument("file_path", help="Path to the JSON file containing the IAM policy.")
+    parser.add_argument("file_path", nargs='*', help="Path to the JSON file containing the IAM policy. "
+                        "Directories, glob patterns and several paths switch to batch mode.")
+    parser.add_argument("--files-from", help="Batch mode: text file with one policy path per line.")
+    parser.add_argument("--format", choices=("text", "json", "sarif", "junit"), default="text",
+                        help="Output format. json, sarif and junit report structured diagnostics (rule, severity, "
+                        "JSON pointer) and always use batch mode.")
+    parser.add_argument("--workers", type=int, default=None, help="Batch and server mode: number of worker processes (default: CPU count).")
+    parser.add_argument("--chunksize", type=int, default=64, help="Batch mode: number of policies sent to a worker at once.")
+    parser.add_argument("--cache", metavar="FILE", help="Batch mode: reuse results of unchanged files stored in this cache file.")
+    parser.add_argument("--cache-size", type=int, default=100000, help="Batch mode: maximum number of cached results.")
+    parser.add_argument("--clear-cache", action="store_true", help="Batch mode: invalidate the cache before validating.")
+    parser.add_argument("--changed-since", metavar="REF", help="Batch mode: validate only files changed since this git revision.")
+    parser.add_argument("--jsonl", metavar="FILE", help="Streaming mode: validate a JSON Lines file ('-' for stdin), "
+                        "one policy per line, and print one JSON result per line.")
+    parser.add_argument("--serve", metavar="PORT", type=int, help="Server mode: serve POST /validate, GET /health and GET /metrics over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Server mode: address to listen on.")
+    parser.add_argument("--cloudformation", action="store_true", help="Template mode: extract and validate the IAM "
+                        "policies embedded in CloudFormation templates (JSON or YAML).")
+    parser.add_argument("--rule-profile", metavar="NAME", help="Rule profile of the config file (strict, prod, dev, ...), "
+                        "default: the config's default_profile.")
+    parser.add_argument("--config", metavar="FILE", default=DEFAULT_CONFIG, help="JSON file with the rule profiles.")
+    parser.add_argument("--watch", action="store_true", help="Watch mode: validate the given paths, then revalidate "
+                        "files as they are saved (inotify on Linux, polling elsewhere).")
+    parser.add_argument("--debounce", type=float, default=0.05, help="Watch mode: seconds without changes before revalidating.")
+    parser.add_argument("--poll", metavar="SECONDS", type=float, default=None,
+                        help="Watch mode: poll for changes every SECONDS instead of using inotify.")
+    parser.add_argument("--resource-patterns", metavar="FILE", help='JSON file with {"allow": [...], "deny": [...]} '
+                        "resource patterns every Resource is checked against.")
+    parser.add_argument("--action-catalog", metavar="FILE", nargs='?', const=DEFAULT_ACTION_CATALOG,
+                        help="Check every Action against a service/action catalog (default: actions.json next to this script).")
+    parser.add_argument("--analyze", action="store_true", help="Account mode: analyze all given policies together and report "
+                        "duplicate statements, shadowed policies and Allow/Deny conflicts as JSON.")
+    parser.add_argument("--simulate", metavar="REQUESTS", help="Simulator mode: evaluate JSON Lines "
+                        '{"action": ..., "resource": ...} requests (\'-\' for stdin) against the given policies.')
+    parser.add_argument("--metrics", metavar="FILE", help="Collect phase and rule timings and write them to FILE "
+                        "(JSON when it ends with .json, Prometheus text otherwise).")
+    parser.add_argument("--slowest", type=int, default=10, help="Number of slowest files kept in the --metrics report.")
+    parser.add_argument("--profile", metavar="FILE", help="Run under cProfile and dump the stats to FILE "
+                        "(use --workers 1 to profile validation in batch mode).")
     args = parser.parse_args()
-    verifier = VeryfingIfValidJSON(args.file_path)
-    print(verifier.main())
+    # Validation options passed to VeryfingIfValidJSON.validate() in every mode
+    options = {"resource_patterns": args.resource_patterns, "action_catalog": args.action_catalog,
+               "profile": args.rule_profile, "config": args.config}
+    try:
+        # Profiles are loaded and compiled once, worker processes load them again on first use
+        load_profile(args.rule_profile, args.config)
+    except Exception as error:
+        parser.error(str(error))
+
+    instrumentation = Instrumentation(args.slowest) if args.metrics else None
+    with (profiling(args.profile) if args.profile else nullcontext()):
+        single_file = len(args.file_path) == 1 and not os.path.isdir(args.file_path[0]) and not glob.has_magic(args.file_path[0])
+        if args.serve is not None:
+            import server
+            exit_code = server.main(args.host, args.serve, args.workers, options)
+        elif args.simulate is not None:
+            import simulator
+            exit_code = simulator.main(args.file_path, args.simulate, args.files_from)
+        elif args.analyze:
+            import analysis
+            exit_code = analysis.main(args.file_path, args.files_from)
+        elif args.cloudformation:
+            import cloudformation
+            exit_code = cloudformation.main(args.file_path, args.files_from, options, args.format)
+        elif args.watch:
+            import watch
+            exit_code = watch.main(args.file_path, args.files_from, options, args.debounce,
+                                   args.poll or 0.5, polling=args.poll is not None)
+        elif args.jsonl is not None:
+            import streaming
+            exit_code = streaming.main(args.jsonl, options, instrumentation)
+        elif single_file and args.files_from is None and args.format == "text":
+            verifier = VeryfingIfValidJSON(args.file_path[0])
+            verifier.instrumentation = instrumentation
+            print(verifier.main(**options))
+            if instrumentation is not None:
+                instrumentation.record_file(args.file_path[0], instrumentation.total("load", "parse", "validate"))
+            exit_code = 0
+        elif args.file_path or args.files_from:
+            import batch
+            exit_code = batch.main(args.file_path, args.files_from, args.workers, args.chunksize,
+                                   cache_path=args.cache, cache_size=args.cache_size, clear_cache=args.clear_cache,
+                                   changed_since=args.changed_since, options=options, instrumentation=instrumentation,
+                                   output_format=args.format)
+        else:
+            parser.error("the following arguments are required: file_path")
+
+    if instrumentation is not None:
+        instrumentation.write(args.metrics)
+        print(instrumentation.report(), file=sys.stderr)
+    sys.exit(exit_code)
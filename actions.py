@@ -0,0 +1,109 @@
+import json
+import os
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+from resources import wildcard_regex
+
+# Catalog of known service actions shipped next to config.json
+DEFAULT_ACTION_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "actions.json")
+
+# Action format according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_action.html
+ACTION_PATTERN = re.compile(r'^([a-z0-9-]+):([A-Za-z0-9*?]+)$', re.IGNORECASE)
+
+
+class ActionCatalog:
+    """
+        Index of known 'service:Action' names. Action names of each service are kept sorted
+        in lower case (IAM action names are case-insensitive), so a wildcard like 's3:Get*'
+        is expanded by a binary search for its literal prefix followed by a regex check of that range only.
+    """
+
+    def __init__(self, services) -> None:
+        self.names = {}
+        self.keys = {}
+        for service, actions in services.items():
+            by_key = {action.lower(): action for action in actions}
+            self.keys[service.lower()] = sorted(by_key)
+            self.names[service.lower()] = by_key
+
+    def has_service(self, service):
+        return service.lower() in self.keys
+
+    def exists(self, action):
+        service, _, name = action.partition(':')
+        return name.lower() in self.names.get(service.lower(), {})
+
+    def expand(self, action):
+        """
+            Return the sorted list of catalog actions matched by 'action', which may contain '*' and '?'.
+        """
+        if action == "*":
+            return [f"{service}:{name}" for service in sorted(self.names) for name in self.expand_service(service, "*")]
+        service, _, pattern = action.partition(':')
+        return [f"{service.lower()}:{name}" for name in self.expand_service(service, pattern)]
+
+    def expand_service(self, service, pattern):
+        keys = self.keys.get(service.lower(), [])
+        names = self.names.get(service.lower(), {})
+        pattern = pattern.lower()
+
+        prefix_end = min((index for index in (pattern.find('*'), pattern.find('?')) if index != -1), default=len(pattern))
+        prefix = pattern[:prefix_end]
+        if prefix_end == len(pattern):
+            return [names[prefix]] if prefix in names else []
+
+        regex = wildcard_regex(pattern)
+        matched = []
+        for key in keys[bisect_left(keys, prefix):]:
+            if not key.startswith(prefix):
+                break
+            if regex.fullmatch(key):
+                matched.append(names[key])
+        return matched
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self.keys.values())
+
+
+@lru_cache(maxsize=None)
+def load_action_catalog(path=DEFAULT_ACTION_CATALOG):
+    """
+        Load a {"service": ["Action", ...]} catalog. Each catalog is parsed once per process,
+        so every file of a batch run served by the same worker shares it.
+    """
+    with open(path, 'r', encoding='UTF-8') as file:
+        return ActionCatalog(json.load(file))
+
+
+def catalog_findings(columns, catalog):
+    """
+        Check 'Action' and 'NotAction' values of every statement against the catalog.
+        Returns (errors, warnings) lists of (statement index, message) findings:
+        unknown or malformed actions are errors, unknown services and over-broad Allow grants are warnings.
+    """
+    errors = []
+    warnings = []
+    for index, (effect, actions, not_actions) in enumerate(zip(columns.effects, columns.actions, columns.not_actions)):
+        for action in (actions or []) + (not_actions or []):
+            if action == "*":
+                continue
+            match = ACTION_PATTERN.match(action) if isinstance(action, str) else None
+            if match is None:
+                errors.append((index, f"Action {action} is not in service:action format"))
+            elif not catalog.has_service(match.group(1)):
+                warnings.append((index, f"Service {match.group(1)} is not in the action catalog"))
+            elif not catalog.expand(action):
+                errors.append((index, f"Action {action} does not match any action in the catalog"))
+
+        if effect != "Allow":
+            continue
+        if not_actions is not None:
+            warnings.append((index, "Allow with NotAction grants every action that is not listed"))
+        for action in actions or ():
+            if action == "*":
+                warnings.append((index, "Action * grants every action of every service"))
+            elif isinstance(action, str) and action.endswith(":*") and catalog.has_service(action[:-2]):
+                warnings.append((index, f"Action {action} grants all {len(catalog.expand(action))} actions of the service"))
+    return errors, warnings
@@ -0,0 +1,259 @@
+import json
+from collections import defaultdict
+
+from batch import collect_policy_files
+from model import PolicyCorpus
+from resources import wildcard_regex
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+
+def _is_wildcard(value):
+    return '*' in value or '?' in value
+
+
+def _literal_prefix(pattern):
+    """
+        Part of a wildcard pattern before its first '*' or '?', the whole value when it has no wildcard.
+    """
+    ends = [index for index in (pattern.find('*'), pattern.find('?')) if index != -1]
+    return pattern[:min(ends)] if ends else pattern
+
+
+class _PrefixTrie:
+    """
+        Character trie of items filed under a string key. along() yields the items whose key is a prefix
+        of a value, below() the items whose key starts with a prefix, neither visits unrelated keys.
+    """
+
+    def __init__(self) -> None:
+        self.root = {}
+
+    def add(self, key, item):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(item)
+
+    def along(self, value):
+        node = self.root
+        yield from node.get(None, ())
+        for char in value:
+            node = node.get(char)
+            if node is None:
+                return
+            yield from node.get(None, ())
+
+    def below(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char is None:
+                    yield from child
+                else:
+                    stack.append(child)
+
+
+class AccountIndex:
+    """
+        Index of every (effect, action, resource, condition) grant of all policies of an account.
+
+        Exact grants are kept in a hash map. Wildcard grants are filed per effect and condition in a trie
+        keyed by the literal prefix of their action, each distinct action pattern with its own trie keyed
+        by the literal prefix of the resource, so checking whether a grant is covered by another policy
+        only visits the patterns whose prefixes match it. Unconditional Deny grants are filed the same way
+        under their full action and resource to find the denies within a broad Allow. Statements are also
+        hashed by their full normalized content to find duplicates. The whole analysis is one
+        pass to build the index and one pass over the grants, no pairwise statement comparison.
+        Policies are kept in a compact PolicyCorpus, so all index keys share its interned strings.
+    """
+
+    def __init__(self) -> None:
+        self.corpus = PolicyCorpus()
+        self.policies = []
+        self.statement_count = 0
+        self.statements = defaultdict(list)
+        self.exact = defaultdict(list)
+        self.wildcard_actions = defaultdict(_PrefixTrie)
+        self.wildcards = {}
+        self.grants = defaultdict(list)
+        self.unenumerable = defaultdict(list)
+        self.deny_actions = _PrefixTrie()
+        self.denies = {}
+        self._regexes = {}
+
+    def add_policy(self, name, data):
+        """
+            Add a parsed policy, policies without a 'PolicyDocument' with 'Statement' are ignored.
+        """
+        policy = self.corpus.add_policy(name, data)
+        if policy is None:
+            return
+        name = self.corpus.names[policy]
+        self.policies.append(name)
+
+        for index, statement in enumerate(self.corpus.statements(policy)):
+            if not statement.is_object:
+                continue
+            self.statement_count += 1
+            location = (name, index)
+            effect = statement.effect
+            condition = statement.condition
+            actions = sorted({self.corpus.strings.intern(action.lower()) for action in statement.actions or ()})
+            resources = sorted(set(statement.resources or ()))
+            not_actions, not_resources = statement.not_actions, statement.not_resources
+
+            signature = (effect, tuple(actions), tuple(resources), condition,
+                         None if not_actions is None else tuple(not_actions),
+                         None if not_resources is None else tuple(not_resources))
+            self.statements[signature].append(location)
+
+            # NotAction/NotResource grants cannot be enumerated and are not indexed as grants
+            if not_actions is not None or not_resources is not None:
+                self.unenumerable[name].append(signature)
+                continue
+            for action in actions:
+                for resource in resources:
+                    grant = (effect, action, resource, condition)
+                    self.grants[name].append((grant, index))
+                    self.exact[grant].append(location)
+                    if _is_wildcard(action) or _is_wildcard(resource):
+                        key = (effect, condition, action)
+                        if key not in self.wildcards:
+                            self.wildcards[key] = _PrefixTrie()
+                            self.wildcard_actions[(effect, condition)].add(_literal_prefix(action), action)
+                        self.wildcards[key].add(_literal_prefix(resource), (resource, location))
+                    if effect == "Deny" and condition is None:
+                        if action not in self.denies:
+                            self.denies[action] = _PrefixTrie()
+                            self.deny_actions.add(action, action)
+                        self.denies[action].add(resource, (resource, location))
+
+    def _matches(self, pattern, value):
+        if not _is_wildcard(pattern):
+            return pattern == value
+        regex = self._regexes.get(pattern)
+        if regex is None:
+            regex = self._regexes[pattern] = wildcard_regex(pattern)
+        return regex.fullmatch(value) is not None
+
+    def covering(self, grant):
+        """
+            Sorted locations (policy, statement index) of grants equal to or covering 'grant'.
+        """
+        effect, action, resource, condition = grant
+        locations = set(self.exact.get(grant, ()))
+        actions = self.wildcard_actions.get((effect, condition))
+        for pattern_action in actions.along(action) if actions is not None else ():
+            if not self._matches(pattern_action, action):
+                continue
+            for pattern_resource, location in self.wildcards[(effect, condition, pattern_action)].along(resource):
+                if self._matches(pattern_resource, resource):
+                    locations.add(location)
+        return sorted(locations)
+
+    def denied_within(self, action, resource):
+        """
+            Unconditional Deny grants (action, resource, location) matched by the 'action' and 'resource'
+            patterns of an Allow, such as a Deny of s3:DeleteBucket within an Allow of s3:*, sorted by location.
+        """
+        denied = []
+        for deny_action in self.deny_actions.below(_literal_prefix(action)):
+            if not self._matches(action, deny_action):
+                continue
+            for deny_resource, location in self.denies[deny_action].below(_literal_prefix(resource)):
+                if self._matches(resource, deny_resource):
+                    denied.append((deny_action, deny_resource, location))
+        return sorted(denied, key=lambda deny: deny[2])
+
+    def duplicates(self):
+        """
+            Groups of statements with identical normalized content.
+        """
+        return [locations for locations in self.statements.values() if len(locations) > 1]
+
+    def shadowed(self):
+        """
+            Policies whose every grant is also granted by other policies, with the policies covering them.
+            A NotAction/NotResource statement only counts as granted elsewhere when another policy has
+            an identical statement.
+        """
+        shadowed = []
+        for name in self.policies:
+            grants = self.grants.get(name, ())
+            unenumerable = self.unenumerable.get(name, ())
+            if not grants and not unenumerable:
+                continue
+            covering_policies = set()
+            for signature in unenumerable:
+                others = {policy for policy, _ in self.statements[signature] if policy != name}
+                if not others:
+                    break
+                covering_policies.update(others)
+            else:
+                for grant, index in grants:
+                    others = {policy for policy, _ in self.covering(grant) if policy != name}
+                    if not others:
+                        break
+                    covering_policies.update(others)
+                else:
+                    shadowed.append({"policy": name, "by": sorted(covering_policies)})
+        return shadowed
+
+    def conflicts(self):
+        """
+            Allow grants overridden by an unconditional Deny: a Deny covering the whole grant, or a narrower
+            Deny within it. 'action' and 'resource' are those of the overridden part.
+        """
+        conflicts = []
+        for name in self.policies:
+            for (effect, action, resource, condition), index in self.grants.get(name, ()):
+                if effect != "Allow":
+                    continue
+                covered = set(self.covering(("Deny", action, resource, None)))
+                for policy, deny_index in sorted(covered):
+                    conflicts.append({"action": action, "resource": resource, "allow": [name, index],
+                                      "deny": [policy, deny_index]})
+                for deny_action, deny_resource, location in self.denied_within(action, resource):
+                    if location not in covered:
+                        conflicts.append({"action": deny_action, "resource": deny_resource, "allow": [name, index],
+                                          "deny": list(location)})
+        return conflicts
+
+    def report(self):
+        return {
+            "policies": len(self.policies),
+            "statements": self.statement_count,
+            "duplicates": [[list(location) for location in group] for group in self.duplicates()],
+            "shadowed": self.shadowed(),
+            "conflicts": self.conflicts(),
+        }
+
+
+def build_index(files):
+    """
+        Load every policy file and add the parseable ones to a new AccountIndex.
+    """
+    index = AccountIndex()
+    for path in files:
+        verifier = VeryfingIfValidJSON(path)
+        try:
+            verifier.loading_file()
+        except Exception:
+            continue
+        index.add_policy(path, verifier.json_data)
+    return index
+
+
+def main(paths, files_from=None):
+    """
+        Analyze all policies found in 'paths' together and print the JSON report.
+    """
+    index = build_index(collect_policy_files(paths, files_from))
+    print(json.dumps(index.report(), indent=4))
+    return 0
@@ -0,0 +1,219 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+from VeryfingIfValidJSON import ValidationResult, VeryfingIfValidJSON
+from cache import ResultCache, file_key, options_key
+from instrumentation import Instrumentation
+from reporting import junit_report, sarif_report
+
+FORMATS = ("text", "json", "sarif", "junit")
+
+
+def collect_policy_files(paths, files_from=None, extensions=(".json",)):
+    """
+        Expand directories, glob patterns and plain file paths into an ordered list of policy files.
+        Directories are searched recursively for files with one of the 'extensions', 'files_from'
+        is a text file with one path per line. Every file is returned only once.
+    """
+    candidates = list(paths)
+    if files_from is not None:
+        with open(files_from, 'r', encoding='UTF-8') as file:
+            candidates.extend(line.strip() for line in file if line.strip())
+
+    seen = set()
+    files = []
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            matches = sorted(match for extension in extensions
+                             for match in glob.glob(os.path.join(candidate, '**', '*' + extension), recursive=True))
+        elif glob.has_magic(candidate):
+            matches = sorted(glob.glob(candidate, recursive=True))
+        else:
+            matches = [candidate]
+
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def validate_file(path, options=None, instrument=False):
+    """
+        Validate one policy file and return a plain, picklable result dictionary.
+        'resource' is the value main() would return, 'errors' lists every finding.
+        'options' are passed to VeryfingIfValidJSON.validate(). With 'instrument' the
+        file's phase and rule timings are added under 'metrics' (see Instrumentation.to_dict()).
+    """
+    verifier = VeryfingIfValidJSON(path)
+    if instrument:
+        verifier.instrumentation = Instrumentation(slowest=1)
+    try:
+        verifier.loading_file()
+    except Exception as error:
+        result = {"path": path, **ValidationResult.from_load_error(str(error)).to_dict()}
+    else:
+        result = {"path": path, **verifier.validate(**(options or {})).to_dict()}
+
+    if instrument:
+        verifier.instrumentation.record_file(path, verifier.instrumentation.total("load", "parse", "validate"))
+        result["metrics"] = verifier.instrumentation.to_dict()
+    return result
+
+
+def changed_files(revision):
+    """
+        Real paths of the files changed since a git revision (committed, staged, unstaged and untracked)
+        below the current directory.
+    """
+    changed = subprocess.run(["git", "diff", "--name-only", "--relative", "--diff-filter=ACMR", revision],
+                             capture_output=True, text=True, check=True).stdout.splitlines()
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"],
+                               capture_output=True, text=True, check=True).stdout.splitlines()
+    return {os.path.realpath(path) for path in changed + untracked}
+
+
+def _validate_files(files, workers, chunksize, options, instrument):
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            yield validate_file(path, options, instrument)
+        return
+
+    with Pool(processes=workers) as pool:
+        validate = partial(validate_file, options=options, instrument=instrument)
+        for result in pool.imap_unordered(validate, files, chunksize=chunksize):
+            yield result
+
+
+def run_batch(files, workers=None, chunksize=64, cache=None, options=None, instrument=False):
+    """
+        Validate 'files' and yield each result as soon as it is ready.
+        With workers=1 files are checked in this process, otherwise they are sent
+        to a process pool in chunks of 'chunksize' and yielded in completion order.
+        When a ResultCache is given, files whose content hash is cached are yielded
+        first without being parsed and only the remaining files are validated.
+        'options' are passed to VeryfingIfValidJSON.validate() and are part of the cache key,
+        'instrument' adds per-file 'metrics' to validated (not cached) results.
+    """
+    if cache is None:
+        yield from _validate_files(files, workers, chunksize, options, instrument)
+        return
+
+    salt = options_key(options)
+    keys = {}
+    misses = []
+    for path in files:
+        key = file_key(path, salt)
+        cached = cache.get(key) if key is not None else None
+        if cached is None:
+            keys[path] = key
+            misses.append(path)
+        else:
+            yield {"path": path, **cached}
+
+    for result in _validate_files(misses, workers, chunksize, options, instrument):
+        key = keys[result["path"]]
+        if key is not None:
+            cache.put(key, {name: value for name, value in result.items() if name not in ("path", "metrics")})
+        yield result
+
+
+class BatchSummary:
+    """
+        Running totals of a batch run.
+    """
+
+    def __init__(self, unit="files") -> None:
+        self.unit = unit
+        self.total = 0
+        self.passed = 0
+        self.wildcard_resource = 0
+        self.failed = 0
+
+    def add(self, result):
+        self.total += 1
+        if not result["valid"]:
+            self.failed += 1
+        elif result["resource"] is False:
+            self.wildcard_resource += 1
+        else:
+            self.passed += 1
+
+    def __str__(self) -> str:
+        return (f"Validated {self.total} {self.unit}: {self.passed} passed, "
+                f"{self.wildcard_resource} with '*' resource, {self.failed} with errors")
+
+
+def format_result(result):
+    """
+        Format a result the same way main() prints a single file.
+    """
+    if result["valid"]:
+        return f"{result['path']}: {result['resource']}"
+    return f"{result['path']}: Error: {result['errors'][0]}"
+
+
+def print_results(results, output_format="text", summary=None):
+    """
+        Print results in 'output_format' as they arrive, followed by the summary, and return the summary.
+        "json" prints one result line with its diagnostics per result, "sarif" and "junit" print one
+        report after all results; the summary then goes to stderr.
+    """
+    summary = summary or BatchSummary()
+    reports = []
+    for result in results:
+        summary.add(result)
+        if output_format == "text":
+            print(format_result(result), flush=True)
+        elif output_format == "json":
+            print(json.dumps(result), flush=True)
+        else:
+            reports.append(result)
+
+    # Reports are sorted by path so they do not depend on the order in which the workers finished
+    reports.sort(key=lambda result: result["path"])
+    if output_format == "sarif":
+        print(json.dumps(sarif_report(reports), indent=2))
+    elif output_format == "junit":
+        print(junit_report(reports))
+    print(summary, file=sys.stdout if output_format == "text" else sys.stderr)
+    return summary
+
+
+def main(paths, files_from=None, workers=None, chunksize=64, cache_path=None, cache_size=100000,
+         clear_cache=False, changed_since=None, options=None, instrumentation=None, output_format="text"):
+    """
+        Validate every policy found in 'paths', print results as they finish and a summary at the end.
+        Metrics of every validated file are merged into 'instrumentation' when it is given.
+        'output_format' is one of FORMATS, see print_results().
+        Returns the process exit code: 1 if any file had errors, 0 otherwise.
+    """
+    files = collect_policy_files(paths, files_from)
+    if changed_since is not None:
+        changed = changed_files(changed_since)
+        files = [path for path in files if os.path.realpath(path) in changed]
+
+    cache = ResultCache(cache_path, cache_size) if cache_path is not None else None
+    if cache is not None and clear_cache:
+        cache.clear()
+
+    def results():
+        for result in run_batch(files, workers, chunksize, cache, options, instrumentation is not None):
+            metrics = result.pop("metrics", None)
+            if metrics is not None:
+                instrumentation.merge(metrics)
+            elif instrumentation is not None:
+                instrumentation.count("cache_hits")
+            yield result
+
+    try:
+        summary = print_results(results(), output_format)
+    finally:
+        if cache is not None:
+            cache.close()
+    return 1 if summary.failed else 0
@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from batch import run_batch
+from model import PolicyCorpus
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+SERVICES = ("s3", "iam", "ec2", "dynamodb", "sqs", "logs", "lambda", "kms")
+VERBS = ("Get", "Put", "List", "Describe", "Create", "Delete", "Update")
+NOUNS = ("Object", "Bucket", "Role", "Policy", "Instance", "Table", "Queue", "Function", "Key")
+
+CHECKS = ("check_required_policy_properties", "check_validate_version", "check_validate_statement",
+          "check_validate_sid", "check_validate_effect", "check_validate_action", "check_validate_resource")
+
+
+def _condition(rng, depth):
+    if depth <= 0:
+        return f"value-{rng.randrange(1000)}"
+    return {f"aws:Key{rng.randrange(10)}": _condition(rng, depth - 1)}
+
+
+def generate_policy(rng, statements=10, actions=5, resources=5, nesting=0):
+    """
+        Build a valid synthetic policy. 'statements' is the number of statements,
+        'actions'/'resources' the length of their lists and 'nesting' the depth of a Condition block.
+    """
+    statement_list = []
+    for index in range(statements):
+        statement = {
+            "Sid": f"Statement{index}",
+            "Effect": rng.choice(("Allow", "Deny")),
+            "Action": [f"{rng.choice(SERVICES)}:{rng.choice(VERBS)}{rng.choice(NOUNS)}" for _ in range(actions)],
+            "Resource": [f"arn:aws:s3:::bucket-{rng.randrange(10000)}/prefix-{rng.randrange(100)}/*" for _ in range(resources)],
+        }
+        if nesting:
+            statement["Condition"] = {"StringEquals": _condition(rng, nesting)}
+        statement_list.append(statement)
+    return {"PolicyName": f"policy-{rng.randrange(10 ** 6)}",
+            "PolicyDocument": {"Version": "2012-10-17", "Statement": statement_list}}
+
+
+def write_policies(directory, count, seed=0, **size):
+    """
+        Write 'count' synthetic policies as JSON files into 'directory' and return their paths.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"policy{index:06d}.json")
+        with open(path, 'w', encoding='UTF-8') as file:
+            json.dump(generate_policy(rng, **size), file)
+        paths.append(path)
+    return paths
+
+
+def _latency(samples):
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 4),
+    }
+
+
+def benchmark_checks(paths):
+    """
+        Per-check latency of every check_validate_* method and of the single-pass validate().
+    """
+    verifiers = []
+    for path in paths:
+        verifier = VeryfingIfValidJSON(path)
+        verifier.loading_file()
+        verifiers.append(verifier)
+
+    results = {}
+    for check in CHECKS + ("validate",):
+        samples = []
+        for verifier in verifiers:
+            started = time.perf_counter()
+            getattr(verifier, check)()
+            samples.append(time.perf_counter() - started)
+        results[check] = _latency(samples)
+    return results
+
+
+def benchmark_end_to_end(paths):
+    """
+        Load + validate latency per file in this process.
+    """
+    samples = []
+    for path in paths:
+        started = time.perf_counter()
+        verifier = VeryfingIfValidJSON(path)
+        verifier.loading_file()
+        verifier.validate()
+        samples.append(time.perf_counter() - started)
+    return {**_latency(samples), "files_per_second": round(len(samples) / sum(samples), 1)}
+
+
+def benchmark_batch(paths, workers, chunksize):
+    started = time.perf_counter()
+    count = sum(1 for _ in run_batch(paths, workers, chunksize))
+    elapsed = time.perf_counter() - started
+    return {"workers": workers, "chunksize": chunksize, "seconds": round(elapsed, 4),
+            "files_per_second": round(count / elapsed, 1)}
+
+
+def _traced_size(build):
+    tracemalloc.start()
+    try:
+        resident = build()
+        return tracemalloc.get_traced_memory()[0], resident
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_memory(paths):
+    """
+        Memory of keeping every policy resident as parsed dicts and lists versus in a PolicyCorpus.
+    """
+    def parsed():
+        policies = []
+        for path in paths:
+            with open(path, 'r', encoding='UTF-8') as file:
+                policies.append(json.load(file))
+        return policies
+
+    def compact():
+        corpus = PolicyCorpus()
+        for path in paths:
+            with open(path, 'r', encoding='UTF-8') as file:
+                corpus.add_policy(path, json.load(file))
+        return corpus
+
+    parsed_bytes, _ = _traced_size(parsed)
+    compact_bytes, corpus = _traced_size(compact)
+    return {"parsed_bytes": parsed_bytes, "compact_bytes": compact_bytes,
+            "ratio": round(compact_bytes / parsed_bytes, 3), "strings": len(corpus.strings)}
+
+
+def run_benchmark(count=200, statements=10, actions=5, resources=5, nesting=0, workers=None, chunksize=64, seed=0):
+    """
+        Generate a synthetic corpus and measure it. Returns a JSON-serializable report.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_policies(directory, count, seed, statements=statements, actions=actions,
+                               resources=resources, nesting=nesting)
+        checks = benchmark_checks(paths)
+        end_to_end = benchmark_end_to_end(paths)
+        # Memory is traced in a separate pass, tracing would distort the timings above
+        tracemalloc.start()
+        benchmark_end_to_end(paths)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        memory = benchmark_memory(paths)
+        batch = [benchmark_batch(paths, 1, chunksize), benchmark_batch(paths, workers, chunksize)]
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "corpus": {"policies": count, "statements": statements, "actions": actions,
+                   "resources": resources, "nesting": nesting, "seed": seed},
+        "checks": checks,
+        "end_to_end": end_to_end,
+        "batch": batch,
+        "peak_memory_bytes": peak_memory,
+        "resident_memory": memory,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark VeryfingIfValidJSON on synthetic policies.")
+    parser.add_argument("--policies", type=int, default=200, help="Number of generated policy files.")
+    parser.add_argument("--statements", type=int, default=10, help="Statements per policy.")
+    parser.add_argument("--actions", type=int, default=5, help="Actions per statement.")
+    parser.add_argument("--resources", type=int, default=5, help="Resources per statement.")
+    parser.add_argument("--nesting", type=int, default=0, help="Depth of a Condition block in every statement.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes of the batch measurement.")
+    parser.add_argument("--chunksize", type=int, default=64, help="Chunk size of the batch measurement.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed generates the same corpus.")
+    parser.add_argument("--output", default="bench_output.txt", help="File the JSON report is appended to, one line per run.")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.policies, args.statements, args.actions, args.resources, args.nesting,
+                           args.workers, args.chunksize, args.seed)
+    with open(args.output, 'a', encoding='UTF-8') as file:
+        file.write(json.dumps(report) + "\n")
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+from VeryfingIfValidJSON import RULESET_VERSION
+
+
+def options_key(options):
+    """
+        Digest of validation options. Option values naming a file (pattern lists, ...)
+        contribute the file content, so editing such a file invalidates the cache.
+    """
+    digest = hashlib.sha256(json.dumps(options or {}, sort_keys=True).encode())
+    for name, value in sorted((options or {}).items()):
+        if isinstance(value, str) and os.path.isfile(value):
+            with open(value, 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def file_key(path, salt=""):
+    """
+        Cache key of a policy file: SHA-256 of the ruleset version, 'salt' (see options_key())
+        and the file content. Returns None when the file cannot be read, such files are never cached.
+    """
+    digest = hashlib.sha256((RULESET_VERSION + salt).encode())
+    try:
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 16), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+        Persistent on-disk cache of validation results stored in SQLite.
+        Entries keep a counter of when they were last used, close() evicts the least
+        recently used ones so that at most 'max_entries' remain.
+    """
+
+    def __init__(self, path, max_entries=100000) -> None:
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used INTEGER NOT NULL)")
+        self.clock = self.connection.execute("SELECT COALESCE(MAX(last_used), 0) FROM results").fetchone()[0]
+
+    def _tick(self):
+        self.clock += 1
+        return self.clock
+
+    def get(self, key):
+        row = self.connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (self._tick(), key))
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        self.connection.execute("INSERT OR REPLACE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+                                (key, json.dumps(result), self._tick()))
+
+    def clear(self):
+        self.connection.execute("DELETE FROM results")
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def evict(self):
+        """
+            Remove the least recently used entries above 'max_entries'.
+        """
+        self.connection.execute(
+            "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,))
+
+    def close(self):
+        self.evict()
+        self.connection.commit()
+        self.connection.close()
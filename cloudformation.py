@@ -0,0 +1,248 @@
+import json
+import re
+from collections import namedtuple
+
+from batch import BatchSummary, collect_policy_files, print_results
+from reporting import WARNING, Diagnostic, json_pointer
+from VeryfingIfValidJSON import RULES, ValidationResult, VeryfingIfValidJSON
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+TEMPLATE_EXTENSIONS = (".json", ".template", ".yaml", ".yml")
+YAML_EXTENSIONS = (".yaml", ".yml")
+
+# Kinds of extracted policies
+INLINE = "inline"
+MANAGED = "managed"
+TRUST = "trust"
+
+# Resources holding one {PolicyName, PolicyDocument} inline policy in their properties
+INLINE_POLICY_TYPES = ("AWS::IAM::Policy", "AWS::IAM::RolePolicy", "AWS::IAM::UserPolicy", "AWS::IAM::GroupPolicy")
+
+# Trust policies name principals, not resources
+TRUST_RULES = RULES.without("resource")
+# A PolicyName built by an intrinsic function is only known when the stack is deployed
+INTRINSIC_NAME_RULES = RULES.without("policy_name")
+
+ExtractedPolicy = namedtuple("ExtractedPolicy", ("path", "kind", "policy"))
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JsonCursor:
+    """
+        Incremental reader of a JSON text: members() walks an object key by key and value()
+        decodes one value, so members that are not needed are dropped as soon as they are read.
+    """
+
+    def __init__(self, text) -> None:
+        self.text = text
+        self.index = 0
+        self.decoder = json.JSONDecoder()
+
+    def peek(self):
+        self.index = _WHITESPACE.match(self.text, self.index).end()
+        return self.text[self.index:self.index + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.text, self.index)
+        self.index += 1
+
+    def value(self):
+        self.peek()
+        value, self.index = self.decoder.raw_decode(self.text, self.index)
+        return value
+
+    def end(self):
+        if self.peek():
+            raise json.JSONDecodeError("Extra data", self.text, self.index)
+
+    def members(self):
+        """
+            Yield the keys of the object at the cursor, each value must be read (value() or members())
+            before the next key is requested.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.index += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.text, self.index)
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == '}':
+                self.index += 1
+                return
+            self.expect(',')
+
+
+def resource_policies(logical_id, resource):
+    """
+        Yield the policies embedded in one template resource: the 'Policies' of AWS::IAM::Role, User and Group,
+        the AssumeRolePolicyDocument of a role, AWS::IAM::Policy, RolePolicy, UserPolicy, GroupPolicy
+        and AWS::IAM::ManagedPolicy documents.
+        Bare documents are wrapped into {"PolicyName", "PolicyDocument"} objects.
+    """
+    properties = resource.get("Properties") if isinstance(resource, dict) else None
+    if not isinstance(properties, dict):
+        return
+    resource_type = resource.get("Type")
+    path = ("Resources", logical_id, "Properties")
+
+    if resource_type in ("AWS::IAM::Role", "AWS::IAM::User", "AWS::IAM::Group"):
+        policies = properties.get("Policies")
+        for index, policy in enumerate(policies if isinstance(policies, list) else []):
+            yield ExtractedPolicy(json_pointer(*path, "Policies", index), INLINE, policy)
+        if resource_type == "AWS::IAM::Role" and "AssumeRolePolicyDocument" in properties:
+            yield ExtractedPolicy(json_pointer(*path, "AssumeRolePolicyDocument"), TRUST,
+                                  {"PolicyName": f"{logical_id}AssumeRolePolicy",
+                                   "PolicyDocument": properties["AssumeRolePolicyDocument"]})
+    elif resource_type in INLINE_POLICY_TYPES:
+        policy = {key: properties[key] for key in ("PolicyName", "PolicyDocument") if key in properties}
+        yield ExtractedPolicy(json_pointer(*path), INLINE, policy)
+    elif resource_type == "AWS::IAM::ManagedPolicy":
+        policy = {"PolicyName": properties.get("ManagedPolicyName", logical_id)}
+        if "PolicyDocument" in properties:
+            policy["PolicyDocument"] = properties["PolicyDocument"]
+        yield ExtractedPolicy(json_pointer(*path), MANAGED, policy)
+
+
+def is_intrinsic(value):
+    """
+        True for a CloudFormation intrinsic function such as {"Ref": ...} or {"Fn::Sub": ...}.
+    """
+    if not isinstance(value, dict) or len(value) != 1:
+        return False
+    name = next(iter(value))
+    return name == "Ref" or name.startswith("Fn::")
+
+
+def _document_policies(document):
+    """
+        Policies of an already loaded document: a template, a list of policies or a single policy.
+    """
+    if isinstance(document, list):
+        for index, policy in enumerate(document):
+            yield ExtractedPolicy(json_pointer(index), INLINE, policy)
+    elif isinstance(document, dict) and isinstance(document.get("Resources"), dict):
+        for logical_id, resource in document["Resources"].items():
+            yield from resource_policies(logical_id, resource)
+    elif isinstance(document, dict) and "PolicyDocument" in document:
+        yield ExtractedPolicy("", INLINE, document)
+
+
+def extract_json_policies(text):
+    """
+        Lazily extract the policies of a JSON template. Only one resource of 'Resources' is decoded at a time
+        and other top-level sections are dropped as soon as they are read, so the parsed template is never held
+        in memory as a whole. A top-level list of policies and a bare policy object are accepted as well.
+    """
+    cursor = _JsonCursor(text)
+    if cursor.peek() != '{':
+        document = cursor.value()
+        cursor.end()
+        yield from _document_policies(document)
+        return
+
+    policy = {}
+    for key in cursor.members():
+        if key == "Resources" and cursor.peek() == '{':
+            for logical_id in cursor.members():
+                yield from resource_policies(logical_id, cursor.value())
+        elif key in ("PolicyName", "PolicyDocument"):
+            policy[key] = cursor.value()
+        else:
+            cursor.value()
+    cursor.end()
+    if "PolicyDocument" in policy:
+        yield ExtractedPolicy("", INLINE, policy)
+
+
+if yaml is not None:
+    class _TemplateLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+        """
+            Safe YAML loader that reads CloudFormation short-form intrinsic functions (!Ref, !Sub, !GetAtt, ...)
+            into their JSON form.
+        """
+
+    def _intrinsic_function(loader, suffix, node):
+        name = suffix if suffix in ("Ref", "Condition") else f"Fn::{suffix}"
+        if isinstance(node, yaml.ScalarNode):
+            value = loader.construct_scalar(node)
+            if suffix == "GetAtt":
+                value = value.split(".", 1)
+        elif isinstance(node, yaml.SequenceNode):
+            value = loader.construct_sequence(node, deep=True)
+        else:
+            value = loader.construct_mapping(node, deep=True)
+        return {name: value}
+
+    _TemplateLoader.add_multi_constructor("!", _intrinsic_function)
+
+
+def extract_yaml_policies(text):
+    """
+        Extract the policies of a YAML template. PyYAML has no incremental loader, the template is loaded whole.
+    """
+    if yaml is None:
+        raise Exception("YAML templates require PyYAML (pip install pyyaml)")
+    try:
+        document = yaml.load(text, Loader=_TemplateLoader)
+    except yaml.YAMLError as error:
+        raise Exception(f"YAML is not valid format: {error}")
+    yield from _document_policies(document)
+
+
+def extract_policies(path):
+    """
+        Yield ExtractedPolicy(path, kind, policy) for every policy of the template file at 'path'.
+        'path' of each policy is the JSON pointer of its location in the template.
+    """
+    with open(path, 'r', encoding='UTF-8') as file:
+        text = file.read()
+    if path.endswith(YAML_EXTENSIONS):
+        yield from extract_yaml_policies(text)
+    else:
+        try:
+            yield from extract_json_policies(text)
+        except json.JSONDecodeError:
+            raise Exception("JSON is not valid format")
+
+
+def validate_template(path, options=None):
+    """
+        Validate every policy of a template and yield one result dictionary per policy, its 'path' is
+        '<file>#<JSON pointer>'. A template that cannot be read yields a single failed result.
+    """
+    try:
+        for extracted in extract_policies(path):
+            verifier = VeryfingIfValidJSON.from_data(extracted.policy, f"{path}#{extracted.path}")
+            rules = TRUST_RULES if extracted.kind == TRUST else None
+            intrinsic_name = isinstance(extracted.policy, dict) and is_intrinsic(extracted.policy.get("PolicyName"))
+            if intrinsic_name:
+                rules = INTRINSIC_NAME_RULES
+            result = verifier.validate(rules=rules, **(options or {}))
+            if intrinsic_name:
+                result.add(Diagnostic("policy_name", WARNING, "/PolicyName",
+                                      "PolicyName is an intrinsic function and is not checked"))
+            yield {"path": verifier.path, "kind": extracted.kind, **result.to_dict()}
+    except OSError:
+        yield {"path": path, **ValidationResult.from_load_error("File loading error").to_dict()}
+    except Exception as error:
+        yield {"path": path, **ValidationResult.from_load_error(str(error)).to_dict()}
+
+
+def main(paths, files_from=None, options=None, output_format="text"):
+    """
+        Validate the policies of every template found in 'paths' and print one result per policy.
+    """
+    templates = collect_policy_files(paths, files_from, TEMPLATE_EXTENSIONS)
+    results = (result for path in templates for result in validate_template(path, options))
+    summary = print_results(results, output_format, BatchSummary("policies"))
+    return 1 if summary.failed else 0
@@ -0,0 +1,149 @@
+import cProfile
+import heapq
+import io
+import json
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+        Timers and counters of one run. Timers keep count, total and maximum seconds per name
+        ("load", "parse", "validate", "rule.sid", ...), 'slowest' files are kept in a bounded heap.
+        Validation code only calls into this class when an instance is attached, so disabled
+        instrumentation costs one 'is None' check per phase.
+    """
+
+    def __init__(self, slowest=10) -> None:
+        self.timers = {}
+        self.counters = {}
+        self.slowest = slowest
+        self.slowest_files = []
+
+    def record(self, name, seconds, count=1):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [count, seconds, seconds]
+        else:
+            timer[0] += count
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def time(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_file(self, path, seconds):
+        entry = (seconds, path)
+        if len(self.slowest_files) < self.slowest:
+            heapq.heappush(self.slowest_files, entry)
+        elif entry > self.slowest_files[0]:
+            heapq.heapreplace(self.slowest_files, entry)
+
+    def merge(self, metrics):
+        """
+            Add metrics produced by to_dict() in another process.
+        """
+        for name, timer in metrics.get("timers", {}).items():
+            current = self.timers.setdefault(name, [0, 0.0, 0.0])
+            current[0] += timer["count"]
+            current[1] += timer["seconds"]
+            current[2] = max(current[2], timer["max_seconds"])
+        for name, value in metrics.get("counters", {}).items():
+            self.count(name, value)
+        for path, seconds in metrics.get("slowest_files", []):
+            self.record_file(path, seconds)
+
+    def total(self, *names):
+        return sum(self.timers[name][1] for name in names if name in self.timers)
+
+    def to_dict(self):
+        return {
+            "timers": {name: {"count": count, "seconds": seconds, "max_seconds": maximum}
+                       for name, (count, seconds, maximum) in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_files": [[path, seconds] for seconds, path in sorted(self.slowest_files, reverse=True)],
+        }
+
+    def to_prometheus(self):
+        """
+            Prometheus text exposition format.
+        """
+        lines = [
+            "# TYPE policy_validation_seconds_total counter",
+            *(f'policy_validation_seconds_total{{phase="{name}"}} {seconds:.9f}'
+              for name, (count, seconds, maximum) in sorted(self.timers.items())),
+            "# TYPE policy_validation_calls_total counter",
+            *(f'policy_validation_calls_total{{phase="{name}"}} {count}'
+              for name, (count, seconds, maximum) in sorted(self.timers.items())),
+            "# TYPE policy_validation_max_seconds gauge",
+            *(f'policy_validation_max_seconds{{phase="{name}"}} {maximum:.9f}'
+              for name, (count, seconds, maximum) in sorted(self.timers.items())),
+            "# TYPE policy_validation_events_total counter",
+            *(f'policy_validation_events_total{{event="{name}"}} {value}'
+              for name, value in sorted(self.counters.items())),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+            Write metrics to 'path', as JSON when it ends with '.json' and as Prometheus text otherwise.
+        """
+        with open(path, 'w', encoding='UTF-8') as file:
+            if path.endswith('.json'):
+                json.dump(self.to_dict(), file, indent=4)
+            else:
+                file.write(self.to_prometheus())
+
+    def report(self):
+        """
+            Human readable summary: time per phase and rule, and the slowest files.
+        """
+        lines = ["Phase timings:"]
+        for name, (count, seconds, maximum) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<24} {seconds * 1000:10.3f} ms total {count:8d} calls {maximum * 1000:9.3f} ms max")
+        if self.slowest_files:
+            lines.append("Slowest files:")
+            for seconds, path in sorted(self.slowest_files, reverse=True):
+                lines.append(f"  {seconds * 1000:10.3f} ms  {path}")
+        return "\n".join(lines)
+
+
+def timed_rule(instrumentation, name, rule, *args):
+    """
+        Run a rule, timing it under 'rule.<name>' when instrumentation is enabled.
+    """
+    if instrumentation is None:
+        return rule(*args)
+    started = time.perf_counter()
+    try:
+        return rule(*args)
+    finally:
+        instrumentation.record(f"rule.{name}", time.perf_counter() - started)
+
+
+@contextmanager
+def profiling(path, top=20):
+    """
+        Run the enclosed block under cProfile, dump the stats to 'path' and print the
+        'top' functions by cumulative time to stderr.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(top)
+        print(output.getvalue(), file=sys.stderr)
@@ -0,0 +1,178 @@
+import json
+from array import array
+
+# Bits of PolicyCorpus.flags, set when the statement has the key
+IS_OBJECT = 1
+HAS_ACTION = 2
+HAS_NOT_ACTION = 4
+HAS_RESOURCE = 8
+HAS_NOT_RESOURCE = 16
+
+# Value lists of a statement, in the order of their offsets
+FIELDS = ("Action", "NotAction", "Resource", "NotResource")
+FIELD_FLAGS = (HAS_ACTION, HAS_NOT_ACTION, HAS_RESOURCE, HAS_NOT_RESOURCE)
+
+
+class StringTable:
+    """
+        Interned strings of a corpus. Every distinct string is stored once and referred to by an
+        integer ID, ID 0 stands for a missing value (None).
+    """
+
+    def __init__(self) -> None:
+        self.ids = {}
+        self.strings = [None]
+
+    def id(self, value):
+        if value is None:
+            return 0
+        identifier = self.ids.get(value)
+        if identifier is None:
+            identifier = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return identifier
+
+    def intern(self, value):
+        """
+            The canonical copy of 'value', equal strings of a corpus share one object.
+        """
+        return self.strings[self.id(value)]
+
+    def __len__(self) -> int:
+        return len(self.strings) - 1
+
+
+class Statement:
+    """
+        Read-only view of statement 'index' of a PolicyCorpus. Values are the corpus' interned strings,
+        Action/NotAction/Resource/NotResource are lists (None when the key is missing) and 'condition'
+        is the Condition block as canonical JSON.
+    """
+
+    __slots__ = ("corpus", "index")
+
+    def __init__(self, corpus, index) -> None:
+        self.corpus = corpus
+        self.index = index
+
+    @property
+    def is_object(self):
+        return bool(self.corpus.flags[self.index] & IS_OBJECT)
+
+    @property
+    def sid(self):
+        return self.corpus.strings.strings[self.corpus.sids[self.index]]
+
+    @property
+    def effect(self):
+        return self.corpus.strings.strings[self.corpus.effects[self.index]]
+
+    @property
+    def condition(self):
+        return self.corpus.strings.strings[self.corpus.conditions[self.index]]
+
+    def _values(self, field):
+        if not self.corpus.flags[self.index] & FIELD_FLAGS[field]:
+            return None
+        position = len(FIELDS) * self.index + field
+        strings = self.corpus.strings.strings
+        return [strings[identifier] for identifier in
+                self.corpus.values[self.corpus.offsets[position]:self.corpus.offsets[position + 1]]]
+
+    @property
+    def actions(self):
+        return self._values(0)
+
+    @property
+    def not_actions(self):
+        return self._values(1)
+
+    @property
+    def resources(self):
+        return self._values(2)
+
+    @property
+    def not_resources(self):
+        return self._values(3)
+
+
+class PolicyCorpus:
+    """
+        Compact in-memory store of many parsed policies. Strings are interned in one StringTable and
+        statements are kept in array-backed columns of string IDs instead of nested dicts and lists:
+        'sids', 'effects', 'conditions' and 'flags' hold one entry per statement, the values of
+        Action/NotAction/Resource/NotResource are concatenated in 'values' and sliced by 'offsets'.
+        Only what cross-policy evaluation reads is kept: non-string Action/Resource values are dropped
+        and statement keys other than Sid, Effect and Condition are not stored.
+    """
+
+    def __init__(self) -> None:
+        self.strings = StringTable()
+        self.names = []
+        self.versions = array('I')
+        self.statement_offsets = array('I', [0])
+        self.sids = array('I')
+        self.effects = array('I')
+        self.conditions = array('I')
+        self.flags = array('B')
+        self.offsets = array('I', [0])
+        self.values = array('I')
+
+    def add_policy(self, name, data):
+        """
+            Add a parsed policy and return its index, None when it has no 'PolicyDocument' with 'Statement'.
+        """
+        document = data.get("PolicyDocument") if isinstance(data, dict) else None
+        if not isinstance(document, dict) or "Statement" not in document:
+            return None
+        statements = document["Statement"]
+        for item in statements if isinstance(statements, list) else [statements]:
+            self._add_statement(item)
+
+        version = document.get("Version")
+        self.names.append(self.strings.intern(name))
+        self.versions.append(self.strings.id(version if isinstance(version, str) else None))
+        self.statement_offsets.append(len(self.effects))
+        return len(self.names) - 1
+
+    def _add_statement(self, item):
+        flags = IS_OBJECT if isinstance(item, dict) else 0
+        if not flags:
+            item = {}
+        sid, effect, condition = item.get("Sid"), item.get("Effect"), item.get("Condition")
+        self.sids.append(self.strings.id(sid if isinstance(sid, str) else None))
+        self.effects.append(self.strings.id(effect if isinstance(effect, str) else None))
+        self.conditions.append(self.strings.id(None if condition is None else json.dumps(condition, sort_keys=True)))
+        for field, flag in zip(FIELDS, FIELD_FLAGS):
+            value = item.get(field)
+            if value is not None:
+                flags |= flag
+                self.values.extend(self.strings.id(entry) for entry in (value if isinstance(value, list) else [value])
+                                   if isinstance(entry, str))
+            self.offsets.append(len(self.values))
+        self.flags.append(flags)
+
+    def statements(self, policy):
+        """
+            Statement views of the policy with index 'policy'.
+        """
+        return [Statement(self, index)
+                for index in range(self.statement_offsets[policy], self.statement_offsets[policy + 1])]
+
+    def version(self, policy):
+        return self.strings.strings[self.versions[policy]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def statement_count(self):
+        return len(self.effects)
+
+    def nbytes(self):
+        """
+            Bytes used by the ID columns, interned strings and names are not included.
+        """
+        columns = (self.versions, self.statement_offsets, self.sids, self.effects, self.conditions,
+                   self.flags, self.offsets, self.values)
+        return sum(len(column) * column.itemsize for column in columns)
@@ -0,0 +1,8 @@
+# Policies built in memory by the tests
+
+# A valid Allow statement tests can extend or override
+READ_STATEMENT = {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/key"}
+
+
+def policy(*statements, name="root"):
+    return {"PolicyName": name, "PolicyDocument": {"Version": "2012-10-17", "Statement": list(statements)}}
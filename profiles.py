@@ -0,0 +1,97 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+# Rule profiles shipped with the validator
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+# How a statement granting a global or service-wide resource wildcard is treated
+WILDCARD_ERROR = "error"
+WILDCARD_REPORT = "report"
+WILDCARD_IGNORE = "ignore"
+WILDCARD_MODES = (WILDCARD_ERROR, WILDCARD_REPORT, WILDCARD_IGNORE)
+
+# PolicyName requirements according to https://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-properties-iam-role-policy.html
+DEFAULT_POLICY_NAME = {"pattern": r"[\w+=,.@-]+", "min_length": 1, "max_length": 128}
+# Sid pattern according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements_sid.html
+DEFAULT_SID = {"pattern": r"[A-Za-z0-9]+", "required": False}
+
+
+class RuleProfile:
+    """
+        Thresholds of one named profile of config.json. Patterns are compiled when the profile is
+        loaded and must match the whole value:
+
+            "policy_name": {"pattern": ..., "min_length": 1, "max_length": 128}
+            "sid": {"pattern": ..., "required": false, "message": ...}
+            "wildcard_resource": "report"   ("error", "report" or "ignore")
+
+        Missing settings keep the AWS limits.
+    """
+
+    def __init__(self, name, settings) -> None:
+        self.name = name
+        policy_name = {**DEFAULT_POLICY_NAME, **settings.get("policy_name", {})}
+        self.policy_name_pattern = re.compile(policy_name["pattern"])
+        self.policy_name_min_length = policy_name["min_length"]
+        self.policy_name_max_length = policy_name["max_length"]
+
+        sid = {**DEFAULT_SID, **settings.get("sid", {})}
+        self.sid_pattern = re.compile(sid["pattern"])
+        self.sid_required = sid["required"]
+        self.sid_message = sid.get("message", f"Invalid SID: Sid must match {sid['pattern']}")
+
+        self.wildcard_resource = settings.get("wildcard_resource", WILDCARD_REPORT)
+        if self.wildcard_resource not in WILDCARD_MODES:
+            raise Exception(f"Profile {name}: wildcard_resource must be one of {', '.join(WILDCARD_MODES)}")
+
+    def valid_policy_name(self, policy_name):
+        return (self.policy_name_pattern.fullmatch(policy_name) is not None
+                and self.policy_name_min_length <= len(policy_name) <= self.policy_name_max_length)
+
+    def valid_sid(self, sid):
+        return isinstance(sid, str) and self.sid_pattern.fullmatch(sid) is not None
+
+
+def _resolve(profiles, name, seen=()):
+    """
+        Settings of profile 'name' with the sections of the profile it 'extends' filled in.
+    """
+    if name not in profiles:
+        raise Exception(f"Unknown rule profile {name}, available: {', '.join(sorted(profiles))}")
+    if name in seen:
+        raise Exception(f"Rule profile {name} extends itself")
+    settings = dict(profiles[name])
+    parent = settings.pop("extends", None)
+    if parent is None:
+        return settings
+    return {**_resolve(profiles, parent, seen + (name,)), **settings}
+
+
+@lru_cache(maxsize=None)
+def load_profiles(path=DEFAULT_CONFIG):
+    """
+        Load every profile of a config file and return (default profile name, {name: RuleProfile}).
+        Each config file is read and compiled once per process.
+    """
+    with open(path, 'r', encoding='UTF-8') as file:
+        config = json.load(file)
+    profiles = config.get("profiles", {})
+    loaded = {name: RuleProfile(name, _resolve(profiles, name)) for name in profiles}
+    default = config.get("default_profile")
+    if default not in loaded:
+        raise Exception(f"Default rule profile {default} is not defined in {path}")
+    return default, loaded
+
+
+def load_profile(name=None, path=None):
+    """
+        The RuleProfile 'name' of the config file at 'path' (default: the shipped config.json),
+        the config's default profile when 'name' is None.
+    """
+    default, profiles = load_profiles(path or DEFAULT_CONFIG)
+    name = name or default
+    if name not in profiles:
+        raise Exception(f"Unknown rule profile {name}, available: {', '.join(sorted(profiles))}")
+    return profiles[name]
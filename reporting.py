@@ -0,0 +1,87 @@
+import xml.etree.ElementTree as ElementTree
+
+ERROR = "error"
+WARNING = "warning"
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "VeryfingIfValidJSON"
+
+
+class Diagnostic:
+    """
+        One finding: the rule that produced it, its severity ("error" or "warning"),
+        a JSON pointer (RFC 6901) to the offending part of the policy and the message.
+    """
+
+    __slots__ = ("rule", "severity", "path", "message")
+
+    def __init__(self, rule, severity, path, message) -> None:
+        self.rule = rule
+        self.severity = severity
+        self.path = path
+        self.message = message
+
+    def to_dict(self):
+        return {"rule": self.rule, "severity": self.severity, "path": self.path, "message": self.message}
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({self.rule!r}, {self.severity!r}, {self.path!r}, {self.message!r})"
+
+
+def json_pointer(*parts):
+    """
+        Build a JSON pointer from path parts, escaping '~' and '/' as RFC 6901 requires.
+    """
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in parts)
+
+
+def sarif_report(results):
+    """
+        SARIF 2.1.0 log of all diagnostics of the given batch results.
+    """
+    rules = {}
+    sarif_results = []
+    for result in results:
+        for diagnostic in result["diagnostics"]:
+            rules.setdefault(diagnostic["rule"], {"id": diagnostic["rule"]})
+            sarif_results.append({
+                "ruleId": diagnostic["rule"],
+                "level": diagnostic["severity"],
+                "message": {"text": diagnostic["message"]},
+                "locations": [{
+                    "physicalLocation": {"artifactLocation": {"uri": result["path"]}},
+                    "logicalLocations": [{"fullyQualifiedName": diagnostic["path"] or "/", "kind": "object"}],
+                }],
+            })
+    return {
+        "version": "2.1.0",
+        "$schema": SARIF_SCHEMA,
+        "runs": [{
+            "tool": {"driver": {"name": TOOL_NAME, "rules": sorted(rules.values(), key=lambda rule: rule["id"])}},
+            "results": sarif_results,
+        }],
+    }
+
+
+def junit_report(results):
+    """
+        JUnit XML with one test case per policy file, failed when the file has errors.
+    """
+    results = list(results)
+    failures = sum(1 for result in results if not result["valid"])
+    suites = ElementTree.Element("testsuites", tests=str(len(results)), failures=str(failures))
+    suite = ElementTree.SubElement(suites, "testsuite", name="policy-validation",
+                                   tests=str(len(results)), failures=str(failures))
+    for result in results:
+        case = ElementTree.SubElement(suite, "testcase", classname="policy", name=result["path"])
+        errors = [diagnostic for diagnostic in result["diagnostics"] if diagnostic["severity"] == ERROR]
+        if errors:
+            failure = ElementTree.SubElement(case, "failure", message=errors[0]["message"], type=errors[0]["rule"])
+            failure.text = "\n".join(f"{diagnostic['path'] or '/'}: [{diagnostic['rule']}] {diagnostic['message']}"
+                                     for diagnostic in errors)
+        warnings = [diagnostic for diagnostic in result["diagnostics"] if diagnostic["severity"] == WARNING]
+        if warnings:
+            output = ElementTree.SubElement(case, "system-out")
+            output.text = "\n".join(f"{diagnostic['path'] or '/'}: [{diagnostic['rule']}] {diagnostic['message']}"
+                                    for diagnostic in warnings)
+    return ElementTree.tostring(suites, encoding="unicode")
@@ -0,0 +1,178 @@
+import json
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Resource ARN format according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference-arns.html
+Arn = namedtuple("Arn", ["partition", "service", "region", "account", "resource"])
+
+WILDCARDS = frozenset("*?")
+
+# Wildcard breadth of a resource, from the narrowest to the broadest
+NONE = "none"
+RESOURCE = "resource"
+SERVICE = "service"
+GLOBAL = "global"
+INVALID = "invalid"
+
+BROAD = frozenset((SERVICE, GLOBAL))
+
+
+def parse_arn(text):
+    """
+        Split an ARN into its components, returns None when 'text' is not an ARN.
+    """
+    if not isinstance(text, str):
+        return None
+    parts = text.split(':', 5)
+    if len(parts) != 6 or parts[0] != "arn" or not parts[1] or not parts[2]:
+        return None
+    return Arn(*parts[1:])
+
+
+def _has_wildcard(text):
+    return not WILDCARDS.isdisjoint(text)
+
+
+def wildcard_breadth(resource):
+    """
+        Classify how much a 'Resource' value matches:
+        GLOBAL   "*" or any service ("arn:aws:*:*:*:*")
+        SERVICE  every resource of a service ("arn:aws:s3:::*", "arn:aws:iam::*:*")
+        RESOURCE a wildcard inside the resource name ("arn:aws:s3:::bucket/*")
+        NONE     no wildcard
+        INVALID  neither "*" nor an ARN
+    """
+    if resource == "*":
+        return GLOBAL
+    arn = parse_arn(resource)
+    if arn is None:
+        return INVALID
+    if _has_wildcard(arn.partition) or _has_wildcard(arn.service):
+        return GLOBAL
+    if arn.resource and all(char in "*?/:" for char in arn.resource) and _has_wildcard(arn.resource):
+        return SERVICE
+    if _has_wildcard(arn.resource) or _has_wildcard(arn.region) or _has_wildcard(arn.account):
+        return RESOURCE
+    return NONE
+
+
+def statement_breadth(effect, resources, not_resources):
+    """
+        Broadest wildcard breadth granted by one statement. An Allow with 'NotResource' grants
+        everything except the listed resources and is therefore GLOBAL, a Deny grants nothing
+        ("Deny * outside eu-west-1" guardrails) and is NONE.
+    """
+    if effect != "Allow":
+        return NONE
+    if not_resources is not None:
+        return GLOBAL
+    order = (INVALID, NONE, RESOURCE, SERVICE, GLOBAL)
+    return max((wildcard_breadth(resource) for resource in resources or ()), key=order.index, default=NONE)
+
+
+def wildcard_pattern(pattern):
+    """
+        Regex source of an IAM pattern: "*" matches any sequence of characters and "?" a single one,
+        everything else literally. Compile it with re.DOTALL, as wildcard_regex() does.
+    """
+    return ''.join('.*' if char == '*' else '.' if char == '?' else re.escape(char) for char in pattern)
+
+
+def wildcard_regex(pattern):
+    return re.compile(wildcard_pattern(pattern), re.DOTALL)
+
+
+class PatternIndex:
+    """
+        Set of resource patterns compiled once into a character trie keyed by the literal
+        prefix of each pattern (the part before the first wildcard).
+        Patterns without a wildcard are looked up in a set. Matching a resource walks the trie
+        along the resource once and only tests the regexes of patterns whose prefix matched.
+    """
+
+    def __init__(self, patterns) -> None:
+        self.exact = set()
+        self.trie = {}
+        self.size = 0
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern):
+        self.size += 1
+        if not _has_wildcard(pattern):
+            self.exact.add(pattern)
+            return
+        prefix_end = min(index for index in (pattern.find('*'), pattern.find('?')) if index != -1)
+        node = self.trie
+        for char in pattern[:prefix_end]:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append((pattern, wildcard_regex(pattern)))
+
+    def match(self, resource):
+        """
+            Return the first pattern matching 'resource' or None.
+        """
+        if resource in self.exact:
+            return resource
+        node = self.trie
+        for char in resource:
+            for pattern, regex in node.get(None, ()):
+                if regex.fullmatch(resource):
+                    return pattern
+            node = node.get(char)
+            if node is None:
+                return None
+        for pattern, regex in node.get(None, ()):
+            if regex.fullmatch(resource):
+                return pattern
+        return None
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class ResourcePatterns:
+    """
+        Organisation allow/deny resource patterns. A resource matching a deny pattern is denied,
+        when allow patterns are given a resource must also match one of them.
+    """
+
+    def __init__(self, allow=(), deny=()) -> None:
+        self.allow = PatternIndex(allow)
+        self.deny = PatternIndex(deny)
+
+    def check(self, resource):
+        """
+            Return an error message for 'resource' or None when it is permitted.
+        """
+        pattern = self.deny.match(resource)
+        if pattern is not None:
+            return f"Resource {resource} matches denied pattern {pattern}"
+        if len(self.allow) and self.allow.match(resource) is None:
+            return f"Resource {resource} does not match any allowed pattern"
+        return None
+
+
+@lru_cache(maxsize=None)
+def load_resource_patterns(path):
+    """
+        Load {"allow": [...], "deny": [...]} patterns from a JSON file, each file is compiled once per process.
+    """
+    with open(path, 'r', encoding='UTF-8') as file:
+        patterns = json.load(file)
+    return ResourcePatterns(patterns.get("allow", ()), patterns.get("deny", ()))
+
+
+def pattern_findings(columns, patterns):
+    """
+        Check every 'Resource' of every statement against ResourcePatterns, returns (statement index, message) findings.
+    """
+    findings = []
+    for index, resources in enumerate(columns.resources):
+        for resource in resources or ():
+            if isinstance(resource, str):
+                message = patterns.check(resource)
+                if message is not None:
+                    findings.append((index, message))
+    return findings
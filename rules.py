@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import timed_rule
+from reporting import ERROR, Diagnostic, json_pointer
+
+
+class Rule:
+    """
+        One validation rule. 'check' receives the RuleContext and returns (statement index, message)
+        error findings, an empty list when the rule passes. Warnings are returned as
+        (statement index, message, WARNING), they never make a policy invalid or skip dependent rules.
+        'depends_on' names rules that must pass first and 'reads' documents the policy fields the rule looks at.
+        Findings with a statement index point at the first field of 'reads' in that statement,
+        findings without one (index None) point at 'path'.
+    """
+
+    def __init__(self, name, check, depends_on=(), reads=(), path="") -> None:
+        self.name = name
+        self.check = check
+        self.depends_on = tuple(depends_on)
+        self.reads = tuple(reads)
+        self.path = path
+
+
+class RuleContext:
+    """
+        State shared by the rules of one validation: the policy data, parsed parts set by
+        earlier rules (document, columns), validation options and the ValidationResult.
+    """
+
+    def __init__(self, data, result, options=None, instrumentation=None) -> None:
+        self.data = data
+        self.result = result
+        self.options = options or {}
+        self.instrumentation = instrumentation
+        self.document = None
+        self.columns = None
+
+    def pointer(self, index, field=None):
+        """
+            JSON pointer of statement 'index' (or of its 'field').
+        """
+        parts = ["PolicyDocument", "Statement"]
+        if self.columns is None or self.columns.is_list:
+            parts.append(index)
+        if field is not None:
+            parts.append(field)
+        return json_pointer(*parts)
+
+
+class ExecutionPlan:
+    """
+        Rules of a registry in dependency order, grouped in levels whose rules only depend
+        on rules of earlier levels. Built once by RuleRegistry.plan().
+    """
+
+    def __init__(self, levels) -> None:
+        self.levels = levels
+
+    @property
+    def order(self):
+        return [rule.name for level in self.levels for rule in level]
+
+    def run(self, context, executor=None):
+        """
+            Run every rule once. Rules whose prerequisites failed or were skipped are skipped.
+            With an 'executor' the rules of one level run concurrently; findings are still
+            added to the result in plan order, so the output does not depend on timing.
+        """
+        failed = set()
+        for level in self.levels:
+            runnable = [rule for rule in level if failed.isdisjoint(rule.depends_on)]
+            failed.update(rule.name for rule in level if not failed.isdisjoint(rule.depends_on))
+
+            def run_rule(rule):
+                return timed_rule(context.instrumentation, rule.name, rule.check, context)
+
+            if executor is not None and len(runnable) > 1:
+                outcomes = list(executor.map(run_rule, runnable))
+            else:
+                outcomes = [run_rule(rule) for rule in runnable]
+
+            for rule, findings in zip(runnable, outcomes):
+                field = rule.reads[0] if rule.reads else None
+                for index, message, *severity in findings:
+                    severity = severity[0] if severity else ERROR
+                    if severity == ERROR:
+                        failed.add(rule.name)
+                    path = rule.path if index is None else context.pointer(index, field)
+                    context.result.add(Diagnostic(rule.name, severity, path, message))
+        return context.result
+
+
+class RuleRegistry:
+    """
+        Registered rules. Org-specific rules are added with register() or the rule() decorator:
+
+            @RULES.rule("require_sid", depends_on=("statement",), reads=("Sid",))
+            def require_sid(context):
+                return [(index, "Sid is required") for index, sid in enumerate(context.columns.sids) if sid is None]
+
+        The execution plan is computed once and rebuilt only after a registration.
+    """
+
+    def __init__(self) -> None:
+        self.rules = {}
+        self._plan = None
+
+    def register(self, name, check, depends_on=(), reads=(), path=""):
+        if name in self.rules:
+            raise Exception(f"Rule {name} is already registered")
+        self.rules[name] = Rule(name, check, depends_on, reads, path)
+        self._plan = None
+
+    def rule(self, name, depends_on=(), reads=(), path=""):
+        def decorator(check):
+            self.register(name, check, depends_on, reads, path)
+            return check
+        return decorator
+
+    def plan(self):
+        """
+            Topologically sort the rules, rules without mutual dependencies keep registration order.
+        """
+        if self._plan is not None:
+            return self._plan
+
+        for rule in self.rules.values():
+            for dependency in rule.depends_on:
+                if dependency not in self.rules:
+                    raise Exception(f"Rule {rule.name} depends on unknown rule {dependency}")
+
+        levels = []
+        placed = set()
+        remaining = list(self.rules.values())
+        while remaining:
+            level = [rule for rule in remaining if placed.issuperset(rule.depends_on)]
+            if not level:
+                raise Exception("Rule dependencies contain a cycle: " + ", ".join(rule.name for rule in remaining))
+            levels.append(level)
+            placed.update(rule.name for rule in level)
+            remaining = [rule for rule in remaining if rule.name not in placed]
+
+        self._plan = ExecutionPlan(levels)
+        return self._plan
+
+    def copy(self):
+        registry = RuleRegistry()
+        registry.rules = dict(self.rules)
+        return registry
+
+    def without(self, *names):
+        """
+            Copy without the named rules, plan() fails if a remaining rule depends on one of them.
+        """
+        registry = self.copy()
+        for name in names:
+            del registry.rules[name]
+        return registry
+
+
+def concurrent_executor(workers=None):
+    """
+        Thread pool for ExecutionPlan.run(), useful for rules that wait on I/O.
+    """
+    return ThreadPoolExecutor(max_workers=workers)
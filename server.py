@@ -0,0 +1,198 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from streaming import validate_record
+from VeryfingIfValidJSON import decode_json
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def validate_body(body, options=None):
+    """
+        Decode a /validate request body and validate its policies, runs inside a worker process so the
+        event loop never parses request JSON and only raw bytes and flat results cross the process boundary.
+        Returns (status, response).
+    """
+    try:
+        payload = decode_json(body)
+    except (ValueError, RecursionError):
+        return 400, {"error": "JSON is not valid format"}
+    if isinstance(payload, list):
+        return 200, [validate_record(record, "<http>", options) for record in payload]
+    return 200, validate_record(payload, "<http>", options)
+
+
+class ServerMetrics:
+    """
+        Counters exposed on GET /metrics.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.requests = 0
+        self.policies = 0
+        self.invalid_policies = 0
+        self.bad_requests = 0
+        self.server_errors = 0
+        self.validation_seconds = 0.0
+
+    def to_dict(self):
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "policies": self.policies,
+            "invalid_policies": self.invalid_policies,
+            "bad_requests": self.bad_requests,
+            "server_errors": self.server_errors,
+            "validation_seconds": round(self.validation_seconds, 6),
+        }
+
+
+class ValidationServer:
+    """
+        Minimal asyncio HTTP/1.1 server validating policies sent in request bodies.
+
+        POST /validate  body is one policy object or a JSON array of policies,
+                        the response is one result object or an array of results
+        GET  /health    liveness check
+        GET  /metrics   request and validation counters
+
+        Connections are kept alive unless the client asks otherwise. Each request body is decoded
+        and validated in a process pool worker. Unexpected errors are answered with 500 and close the connection.
+    """
+
+    def __init__(self, workers=None, options=None) -> None:
+        self.workers = workers
+        self.options = options
+        self.executor = None
+        self.metrics = ServerMetrics()
+
+    async def validate(self, body):
+        started = time.perf_counter()
+        if self.executor is None:
+            status, response = validate_body(body, self.options)
+        else:
+            status, response = await asyncio.get_running_loop().run_in_executor(
+                self.executor, validate_body, body, self.options)
+        self.metrics.validation_seconds += time.perf_counter() - started
+
+        if status == 200:
+            results = response if isinstance(response, list) else [response]
+            self.metrics.policies += len(results)
+            self.metrics.invalid_policies += sum(1 for result in results if not result["valid"])
+        return status, response
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.to_dict()
+        if path != "/validate":
+            return 404, {"error": "Not found"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        return await self.validate(body)
+
+    async def read_request(self, reader):
+        """
+            Read one request and route it, return (status, response, keep_alive) or None when the client is done.
+        """
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, path, version = request_line.decode('latin-1').split()
+        except ValueError:
+            return None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+        length = headers.get("content-length")
+        try:
+            length = None if length is None else int(length)
+        except ValueError:
+            length = -1
+        if method == "POST" and length is None:
+            return 411, {"error": "Content-Length required"}, False
+        if length is not None and length < 0:
+            # The body cannot be skipped without a valid length, so the connection is closed
+            return 400, {"error": "Content-Length must be a non-negative integer"}, False
+        if length is not None and length > MAX_BODY_SIZE:
+            return 413, {"error": "Request body too large"}, False
+        body = await reader.readexactly(length) if length else b''
+        status, response = await self.route(method, path.split('?', 1)[0], body)
+        return status, response, keep_alive
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception as error:
+                    # Over-long lines, unreadable option files, worker failures: the stream state is unknown
+                    self.metrics.server_errors += 1
+                    request = 500, {"error": f"Internal server error: {error}"}, False
+                if request is None:
+                    break
+                status, response, keep_alive = request
+
+                self.metrics.requests += 1
+                if 400 <= status < 500:
+                    self.metrics.bad_requests += 1
+                self.write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def write_response(writer, status, response, keep_alive):
+        body = json.dumps(response).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+
+    async def serve(self, host, port, ready=None):
+        """
+            Start the worker pool and serve until cancelled. 'ready' is called with the bound server socket address.
+        """
+        if self.workers != 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            if ready is not None:
+                ready(server.sockets[0].getsockname())
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+
+
+def main(host, port, workers=None, options=None):
+    server = ValidationServer(workers, options)
+    try:
+        asyncio.run(server.serve(host, port, lambda address: print(f"Serving on http://{address[0]}:{address[1]}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,197 @@
+import json
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
+
+from batch import collect_policy_files
+from streaming import read_jsonl
+from model import PolicyCorpus
+from resources import wildcard_pattern
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+# Decisions according to https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_evaluation-logic.html
+ALLOWED = "allowed"
+EXPLICIT_DENY = "explicitDeny"
+IMPLICIT_DENY = "implicitDeny"
+# A statement with a Condition decides the request, its condition cannot be evaluated without request context
+CONDITIONAL = "conditional"
+
+
+class _Matcher:
+    """
+        Compiled list of IAM patterns: literal values are looked up in a set, patterns with
+        '*' or '?' are joined into one regex.
+    """
+
+    def __init__(self, patterns, ignore_case) -> None:
+        self.ignore_case = ignore_case
+        self.exact = set()
+        wildcards = []
+        for pattern in patterns:
+            if not isinstance(pattern, str):
+                continue
+            if ignore_case:
+                pattern = pattern.lower()
+            if '*' in pattern or '?' in pattern:
+                wildcards.append(wildcard_pattern(pattern))
+            else:
+                self.exact.add(pattern)
+        self.regex = re.compile('|'.join(f'(?:{pattern})' for pattern in wildcards), re.DOTALL) if wildcards else None
+
+    def matches(self, value):
+        if self.ignore_case:
+            value = value.lower()
+        return value in self.exact or (self.regex is not None and self.regex.fullmatch(value) is not None)
+
+
+class CompiledStatement:
+    """
+        One statement ready for evaluation. 'negate_*' is set for NotAction/NotResource,
+        which match every value that is not listed, 'conditional' for statements with a Condition.
+    """
+
+    __slots__ = ("effect", "actions", "negate_actions", "resources", "negate_resources", "location", "conditional")
+
+    def __init__(self, effect, actions, negate_actions, resources, negate_resources, location, conditional=False) -> None:
+        self.effect = effect
+        self.actions = _Matcher(actions, ignore_case=True)
+        self.negate_actions = negate_actions
+        self.resources = _Matcher(resources, ignore_case=False)
+        self.negate_resources = negate_resources
+        self.location = location
+        self.conditional = conditional
+
+    def applies(self, action, resource):
+        return (self.actions.matches(action) != self.negate_actions
+                and self.resources.matches(resource) != self.negate_resources)
+
+
+class PolicySimulator:
+    """
+        Evaluates (action, resource) requests against a set of identity policies:
+        an explicit Deny overrides any Allow and a request no statement allows is implicitly denied.
+
+        Statements are precompiled into a decision index keyed by the action's service prefix,
+        statements that may match every service ('*', 's3*:...', NotAction) are kept in one shared
+        list. A query only evaluates its service's candidates, and repeated queries are answered
+        from an LRU cache. Statements with a 'Condition' cannot be decided without request context:
+        when one of them could change the decision (a conditional Deny of an allowed request, a
+        conditional Allow of an otherwise denied one) the decision is CONDITIONAL. Policies are kept in a compact PolicyCorpus with interned strings.
+    """
+
+    def __init__(self, cache_size=1 << 16) -> None:
+        self.corpus = PolicyCorpus()
+        self.by_service = defaultdict(list)
+        self.any_service = []
+        self.statements = 0
+        self.conditional = 0
+        self.evaluate = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    def add_policy(self, name, data):
+        policy = self.corpus.add_policy(name, data)
+        if policy is None:
+            return
+        name = self.corpus.names[policy]
+        for index, statement in enumerate(self.corpus.statements(policy)):
+            effect = statement.effect
+            if not statement.is_object or effect not in ("Allow", "Deny"):
+                continue
+            actions, not_actions = statement.actions, statement.not_actions
+            resources, not_resources = statement.resources, statement.not_resources
+            if (actions is None and not_actions is None) or (resources is None and not_resources is None):
+                continue
+            conditional = statement.condition is not None
+            if conditional:
+                self.conditional += 1
+
+            negate_actions = actions is None
+            actions = not_actions if negate_actions else actions
+            negate_resources = resources is None
+            resources = not_resources if negate_resources else resources
+            compiled = CompiledStatement(effect, actions, negate_actions, resources, negate_resources, (name, index),
+                                         conditional)
+            self.statements += 1
+
+            services = {action.partition(':')[0].lower() for action in actions}
+            if negate_actions or any('*' in service or '?' in service for service in services):
+                self.any_service.append(compiled)
+            else:
+                for service in services:
+                    self.by_service[service].append(compiled)
+        self.evaluate.cache_clear()
+
+    def _evaluate(self, action, resource):
+        """
+            Return (decision, matched statement location or None).
+        """
+        service = action.partition(':')[0].lower()
+        allowed_by = conditional_allow = conditional_deny = None
+        for candidates in (self.by_service.get(service, ()), self.any_service):
+            for statement in candidates:
+                if not statement.applies(action, resource):
+                    continue
+                if statement.conditional:
+                    if statement.effect == "Deny":
+                        conditional_deny = conditional_deny or statement.location
+                    else:
+                        conditional_allow = conditional_allow or statement.location
+                elif statement.effect == "Deny":
+                    return EXPLICIT_DENY, statement.location
+                elif allowed_by is None:
+                    allowed_by = statement.location
+        if allowed_by is not None or conditional_allow is not None:
+            # A matching conditional Deny may still deny an allowed request
+            if conditional_deny is not None:
+                return CONDITIONAL, conditional_deny
+            if allowed_by is not None:
+                return ALLOWED, allowed_by
+            return CONDITIONAL, conditional_allow
+        return IMPLICIT_DENY, None
+
+    def evaluate_many(self, requests):
+        """
+            Evaluate an iterable of (action, resource) pairs lazily, yielding (decision, location).
+        """
+        for action, resource in requests:
+            yield self.evaluate(action, resource)
+
+    def evaluate_jsonl(self, input_file, output_file):
+        """
+            Read {"action": ..., "resource": ...} requests line by line and write one JSON decision line per request.
+        """
+        for line_number, request, error in read_jsonl(input_file):
+            if error is None and isinstance(request, dict) and isinstance(request.get("action"), str) \
+                    and isinstance(request.get("resource"), str):
+                decision, location = self.evaluate(request["action"], request["resource"])
+                output = {"line": line_number, "action": request["action"], "resource": request["resource"],
+                          "decision": decision, "statement": list(location) if location else None}
+            else:
+                output = {"line": line_number, "error": error or "Request must have string 'action' and 'resource'"}
+            output_file.write(json.dumps(output) + "\n")
+        output_file.flush()
+
+
+def load_simulator(files):
+    simulator = PolicySimulator()
+    for path in files:
+        verifier = VeryfingIfValidJSON(path)
+        try:
+            verifier.loading_file()
+        except Exception:
+            continue
+        simulator.add_policy(path, verifier.json_data)
+    return simulator
+
+
+def main(paths, requests_path, files_from=None):
+    """
+        Load the policies found in 'paths' and evaluate the JSON Lines requests of 'requests_path' ('-' for stdin).
+    """
+    simulator = load_simulator(collect_policy_files(paths, files_from))
+    if requests_path == '-':
+        simulator.evaluate_jsonl(sys.stdin, sys.stdout)
+    else:
+        with open(requests_path, 'r', encoding='UTF-8') as file:
+            simulator.evaluate_jsonl(file, sys.stdout)
+    return 0
@@ -0,0 +1,60 @@
+import json
+import sys
+
+from VeryfingIfValidJSON import ValidationResult, VeryfingIfValidJSON, decode_json
+
+
+def read_jsonl(file):
+    """
+        Lazily read a JSON Lines stream and yield (line_number, record, error) for every non-empty line.
+        Only one line is held in memory at a time, 'error' is set when the line is not valid JSON.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, decode_json(line), None
+        except ValueError:
+            yield line_number, None, "JSON is not valid format"
+
+
+def validate_record(record, source="<stream>", options=None, instrumentation=None):
+    """
+        Validate one already parsed policy record and return its result dictionary.
+        'options' are passed to VeryfingIfValidJSON.validate(), timings are collected in 'instrumentation' when given.
+    """
+    verifier = VeryfingIfValidJSON.from_data(record, source)
+    verifier.instrumentation = instrumentation
+    return verifier.validate(**(options or {})).to_dict()
+
+
+def validate_stream(input_file, output_file, options=None, instrumentation=None):
+    """
+        Validate every record of a JSON Lines stream and write one JSON result line per input record.
+        Returns the number of invalid records.
+    """
+    failed = 0
+    for line_number, record, error in read_jsonl(input_file):
+        if error is None:
+            result = validate_record(record, f"<line {line_number}>", options, instrumentation)
+        else:
+            result = ValidationResult.from_load_error(error).to_dict()
+
+        if not result["valid"]:
+            failed += 1
+        output_file.write(json.dumps({"line": line_number, **result}) + "\n")
+    output_file.flush()
+    return failed
+
+
+def main(input_path, options=None, instrumentation=None):
+    """
+        Validate a JSON Lines file ('-' reads from stdin) and write results to stdout.
+        Returns the process exit code: 1 if any record had errors, 0 otherwise.
+    """
+    if input_path == '-':
+        failed = validate_stream(sys.stdin, sys.stdout, options, instrumentation)
+    else:
+        with open(input_path, 'r', encoding='UTF-8') as file:
+            failed = validate_stream(file, sys.stdout, options, instrumentation)
+    return 1 if failed else 0
@@ -0,0 +1,42 @@
+import unittest
+from actions import ActionCatalog, load_action_catalog
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestActions(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = ActionCatalog({"s3": ["GetObject", "GetObjectAcl", "GetBucketAcl", "PutObject"],
+                                      "iam": ["ListRoles"]})
+
+    def test_exists_is_case_insensitive(self):
+        self.assertTrue(self.catalog.exists("s3:GetObject"))
+        self.assertTrue(self.catalog.exists("S3:getobject"))
+        self.assertFalse(self.catalog.exists("s3:GetObjekt"))
+        self.assertFalse(self.catalog.exists("sqs:SendMessage"))
+
+    def test_expand_wildcards(self):
+        self.assertEqual(["s3:GetBucketAcl", "s3:GetObject", "s3:GetObjectAcl"], self.catalog.expand("s3:Get*"))
+        self.assertEqual(["s3:GetBucketAcl", "s3:GetObjectAcl"], self.catalog.expand("s3:Get*Acl"))
+        self.assertEqual(["s3:PutObject"], self.catalog.expand("s3:?utObject"))
+        self.assertEqual(5, len(self.catalog.expand("*")))
+        self.assertEqual([], self.catalog.expand("s3:Delete*"))
+
+    def test_shipped_catalog_is_loaded_once(self):
+        self.assertIs(load_action_catalog(), load_action_catalog())
+        self.assertTrue(load_action_catalog().exists("iam:ListRoles"))
+
+    def test_validate_with_action_catalog(self):
+        obj = VeryfingIfValidJSON("Test/actionCatalogPolicy.json")
+        obj.loading_file()
+        result = obj.validate(action_catalog=self.catalog)
+        self.assertEqual([
+            "Action s3:GetObjekt does not match any action in the catalog",
+            "Action iam ListRoles is not in service:action format",
+        ], result.errors)
+        self.assertEqual([
+            "Service athena is not in the action catalog",
+            "Action s3:* grants all 4 actions of the service",
+        ], result.warnings)
+
+if __name__ == '__main__':
+    unittest.main()
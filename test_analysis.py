@@ -0,0 +1,80 @@
+import unittest
+from analysis import AccountIndex, build_index
+from policy_fixtures import policy
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AccountIndex()
+        self.index.add_policy("broad", policy(
+            {"Effect": "Allow", "Action": "s3:*", "Resource": "arn:aws:s3:::bucket/*"}))
+        self.index.add_policy("narrow", policy(
+            {"Effect": "Allow", "Action": ["s3:GetObject", "S3:PutObject"], "Resource": "arn:aws:s3:::bucket/key"}))
+        self.index.add_policy("copy", policy(
+            {"Effect": "Allow", "Action": ["s3:PutObject", "s3:GetObject"], "Resource": ["arn:aws:s3:::bucket/key"]},
+            {"Effect": "Allow", "Action": "sqs:SendMessage", "Resource": "arn:aws:sqs:eu-west-1:123456789012:queue"}))
+        self.index.add_policy("deny", policy(
+            {"Effect": "Deny", "Action": "sqs:*", "Resource": "*"},
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "*", "Condition": {"Bool": {"aws:SecureTransport": "false"}}}))
+
+    def test_duplicate_statements(self):
+        self.assertEqual([[("narrow", 0), ("copy", 0)]], self.index.duplicates())
+
+    def test_shadowed_policies(self):
+        self.assertEqual([{"policy": "narrow", "by": ["broad", "copy"]}], self.index.shadowed())
+
+    def test_not_action_statement_is_not_shadowed(self):
+        index = AccountIndex()
+        index.add_policy("mixed", policy(
+            {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/key"},
+            {"Effect": "Allow", "NotAction": "iam:*", "Resource": "*"}))
+        index.add_policy("s3", policy({"Effect": "Allow", "Action": "s3:*", "Resource": "*"}))
+        self.assertEqual([], index.shadowed())
+        index.add_policy("copy", policy({"Effect": "Allow", "NotAction": "iam:*", "Resource": "*"}))
+        self.assertEqual([{"policy": "mixed", "by": ["copy", "s3"]}, {"policy": "copy", "by": ["mixed"]}],
+                         index.shadowed())
+
+    def test_allow_deny_conflicts(self):
+        self.assertEqual([{"action": "sqs:sendmessage", "resource": "arn:aws:sqs:eu-west-1:123456789012:queue",
+                           "allow": ["copy", 1], "deny": ["deny", 0]}], self.index.conflicts())
+
+    def test_narrow_deny_within_broad_allow(self):
+        index = AccountIndex()
+        index.add_policy("admin", policy({"Effect": "Allow", "Action": "s3:*", "Resource": "*"}))
+        index.add_policy("protect", policy({"Effect": "Deny", "Action": "s3:DeleteBucket", "Resource": "arn:aws:s3:::prod"}))
+        self.assertEqual([{"action": "s3:deletebucket", "resource": "arn:aws:s3:::prod",
+                           "allow": ["admin", 0], "deny": ["protect", 0]}], index.conflicts())
+
+    def test_wildcard_service_grants(self):
+        index = AccountIndex()
+        index.add_policy("broad", policy({"Effect": "Allow", "Action": "s3*:Get*", "Resource": "*"}))
+        index.add_policy("narrow", policy({"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/key"}))
+        self.assertEqual([("broad", 0)], [location for location in index.covering(
+            ("Allow", "s3:getobject", "arn:aws:s3:::bucket/key", None)) if location[0] == "broad"])
+
+    def test_lookups_scale_with_matching_patterns_only(self):
+        def matches_for(count):
+            index = AccountIndex()
+            for number in range(count):
+                bucket = f"arn:aws:s3:::bucket-{number}"
+                index.add_policy(f"policy{number}", policy(
+                    {"Effect": "Allow", "Action": "s3:*", "Resource": f"{bucket}/*"},
+                    {"Effect": "Allow", "Action": "s3:GetObject", "Resource": f"{bucket}/key"},
+                    {"Effect": "Deny", "Action": "s3:DeleteObject", "Resource": f"{bucket}/secret"}))
+            calls = []
+            matches = index._matches
+            index._matches = lambda pattern, value: calls.append(pattern) or matches(pattern, value)
+            report = index.report()
+            self.assertEqual(count, len(report["conflicts"]))
+            return len(calls)
+
+        self.assertLessEqual(matches_for(400), 5 * matches_for(100))
+
+    def test_report_from_files(self):
+        report = build_index(["Test/correctJsonFormat.json", "Test/resourceInput1.json", "Test/wrongJsonFormat1.json"]).report()
+        self.assertEqual(2, report["policies"])
+        self.assertEqual(1, len(report["duplicates"]))
+        self.assertEqual(2, len(report["shadowed"]))
+
+if __name__ == '__main__':
+    unittest.main()
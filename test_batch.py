@@ -0,0 +1,62 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from batch import changed_files, collect_policy_files, run_batch, validate_file, BatchSummary
+
+class TestBatch(unittest.TestCase):
+
+    def test_collect_files_from_directory(self):
+        files = collect_policy_files(["Test"])
+        self.assertIn(os.path.join("Test", "correctJsonFormat.json"), files)
+        self.assertEqual(len(files), len(set(files)))
+
+    def test_collect_files_from_glob_and_list(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file_list:
+            file_list.write("Test/resourceInput1.json\nTest/correctSID.json\n")
+        try:
+            files = collect_policy_files(["Test/resourceInput*.json"], file_list.name)
+        finally:
+            os.remove(file_list.name)
+        self.assertEqual(["Test/resourceInput1.json", "Test/resourceInput2.json",
+                          "Test/resourceInput3.json", "Test/correctSID.json"], files)
+
+    def test_validate_file_results(self):
+        self.assertEqual(False, validate_file("Test/resourceInput1.json")["resource"])
+        result = validate_file("non_existent_file.json")
+        self.assertFalse(result["valid"])
+        self.assertEqual(["File loading error"], result["errors"])
+
+    def test_changed_files_are_real_paths(self):
+        current = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                for name in ("committed.json", "changed.json"):
+                    with open(name, 'w') as file:
+                        file.write("{}")
+                git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+                subprocess.run(git + ["init", "-q"], check=True)
+                subprocess.run(git + ["add", "."], check=True)
+                subprocess.run(git + ["commit", "-q", "-m", "initial"], check=True)
+                with open("changed.json", 'w') as file:
+                    file.write("[]")
+                with open("created.json", 'w') as file:
+                    file.write("{}")
+                changed = changed_files("HEAD")
+            finally:
+                os.chdir(current)
+        self.assertEqual({os.path.join(os.path.realpath(directory), name) for name in ("changed.json", "created.json")},
+                         changed)
+
+    def test_run_batch_with_pool(self):
+        files = collect_policy_files(["Test/resourceInput*.json", "Test/missingAction.json"])
+        results = {result["path"]: result for result in run_batch(files, workers=2, chunksize=1)}
+        self.assertEqual(set(files), set(results))
+        summary = BatchSummary()
+        for result in results.values():
+            summary.add(result)
+        self.assertEqual((4, 2, 1, 1), (summary.total, summary.passed, summary.wildcard_resource, summary.failed))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import random
+import tempfile
+import unittest
+from benchmark import generate_policy, run_benchmark, write_policies
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_generated_policy_is_valid(self):
+        policy = generate_policy(random.Random(1), statements=3, actions=2, resources=4, nesting=2)
+        statements = policy["PolicyDocument"]["Statement"]
+        self.assertEqual(3, len(statements))
+        self.assertEqual(4, len(statements[0]["Resource"]))
+        self.assertTrue(VeryfingIfValidJSON.from_data(policy).validate().valid)
+
+    def test_same_seed_generates_same_corpus(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            for path_a, path_b in zip(write_policies(first, 3, seed=7), write_policies(second, 3, seed=7)):
+                with open(path_a) as file_a, open(path_b) as file_b:
+                    self.assertEqual(file_a.read(), file_b.read())
+
+    def test_run_benchmark_report(self):
+        report = run_benchmark(count=3, statements=2, workers=1)
+        self.assertIn("validate", report["checks"])
+        self.assertEqual(3, report["corpus"]["policies"])
+        self.assertGreater(report["peak_memory_bytes"], 0)
+        self.assertGreater(report["resident_memory"]["parsed_bytes"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
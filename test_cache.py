@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import batch
+from batch import run_batch
+from cache import ResultCache, file_key
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.cache_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.cache_path)
+
+    def test_file_key_depends_on_content(self):
+        self.assertEqual(file_key("Test/resourceInput1.json"), file_key("Test/correctJsonFormat.json"))
+        self.assertNotEqual(file_key("Test/resourceInput1.json"), file_key("Test/resourceInput2.json"))
+        self.assertIsNone(file_key("non_existent_file.json"))
+
+    def test_cached_files_are_not_validated_again(self):
+        files = ["Test/resourceInput1.json", "Test/resourceInput2.json", "Test/missingAction.json"]
+        cache = ResultCache(self.cache_path)
+        first = list(run_batch(files, workers=1, cache=cache))
+        cache.close()
+
+        cache = ResultCache(self.cache_path)
+        with mock.patch.object(batch, "validate_file", side_effect=AssertionError("file validated again")):
+            second = list(run_batch(files, workers=1, cache=cache))
+        cache.close()
+        self.assertEqual(first, second)
+
+    def test_lru_eviction_and_clear(self):
+        cache = ResultCache(self.cache_path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, {"valid": True})
+        cache.get("a")
+        cache.evict()
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual({"valid": True}, cache.get("a"))
+        self.assertEqual(2, len(cache))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
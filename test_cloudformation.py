@@ -0,0 +1,67 @@
+import json
+import unittest
+from cloudformation import (INLINE, MANAGED, TRUST, extract_json_policies, extract_policies, is_intrinsic,
+                            validate_template)
+
+class TestCloudFormation(unittest.TestCase):
+
+    def test_extract_json_template(self):
+        extracted = list(extract_policies("Test/cloudformation/template.json"))
+        self.assertEqual([("/Resources/AppRole/Properties/Policies/0", INLINE),
+                          ("/Resources/AppRole/Properties/Policies/1", INLINE),
+                          ("/Resources/AppRole/Properties/AssumeRolePolicyDocument", TRUST),
+                          ("/Resources/AdminRolePolicy/Properties", INLINE),
+                          ("/Resources/DeployUserPolicy/Properties", INLINE),
+                          ("/Resources/OpsGroupPolicy/Properties", INLINE),
+                          ("/Resources/LogsPolicy/Properties", MANAGED)],
+                         [(policy.path, policy.kind) for policy in extracted])
+        self.assertEqual("read-bucket", extracted[0].policy["PolicyName"])
+        self.assertEqual({"PolicyName", "PolicyDocument"}, set(extracted[3].policy))
+        self.assertEqual("LogsPolicy", extracted[6].policy["PolicyName"])
+
+    def test_extract_yaml_template_with_intrinsic_functions(self):
+        extracted = list(extract_policies("Test/cloudformation/template.yaml"))
+        self.assertEqual(3, len(extracted))
+        statement = extracted[0].policy["PolicyDocument"]["Statement"][0]
+        self.assertEqual({"Fn::GetAtt": ["Queue", "Arn"]}, statement["Resource"])
+        self.assertEqual({"Fn::Sub": "${AWS::StackName}-send-messages"}, extracted[0].policy["PolicyName"])
+
+    def test_intrinsic_policy_name_is_a_warning(self):
+        result = next(validate_template("Test/cloudformation/template.yaml"))
+        self.assertTrue(result["valid"])
+        self.assertEqual(["PolicyName is an intrinsic function and is not checked"], result["warnings"])
+        self.assertEqual("/PolicyName", result["diagnostics"][0]["path"])
+        self.assertTrue(is_intrinsic({"Ref": "Name"}))
+        self.assertFalse(is_intrinsic({"Name": "value"}))
+
+    def test_json_extraction_is_lazy(self):
+        template = '{"Resources": {"Role": {"Type": "AWS::IAM::Role", "Properties": {"Policies": [{"PolicyName": "a"}]}}}, "Outputs": {'
+        policies = extract_json_policies(template)
+        self.assertEqual("a", next(policies).policy["PolicyName"])
+        with self.assertRaises(json.JSONDecodeError):
+            next(policies)
+
+    def test_lists_and_bare_policies(self):
+        with open("Test/correctJsonFormat.json") as file:
+            policy = json.load(file)
+        self.assertEqual([("", policy)], [(item.path, item.policy) for item in extract_json_policies(json.dumps(policy))])
+        self.assertEqual(["/0", "/1"], [item.path for item in extract_json_policies(json.dumps([policy, policy]))])
+
+    def test_validate_template(self):
+        results = {result["path"]: result for result in validate_template("Test/cloudformation/template.json")}
+        prefix = "Test/cloudformation/template.json#/Resources/"
+        self.assertEqual(["Invalid SID: The Sid element supports ASCII uppercase letters (A-Z), lowercase letters (a-z), "
+                          "and numbers (0-9)"], results[prefix + "AppRole/Properties/Policies/1"]["errors"])
+        # Trust policies have no Resource
+        self.assertTrue(results[prefix + "AppRole/Properties/AssumeRolePolicyDocument"]["valid"])
+        self.assertIs(False, results[prefix + "LogsPolicy/Properties"]["resource"])
+        self.assertIs(False, results[prefix + "AdminRolePolicy/Properties"]["resource"])
+        self.assertTrue(results[prefix + "DeployUserPolicy/Properties"]["valid"])
+        self.assertEqual(["Resource or NotResource must be included in Statement"],
+                         results[prefix + "OpsGroupPolicy/Properties"]["errors"])
+
+        result, = validate_template("Test/wrongJsonFormat3.json")
+        self.assertEqual(["JSON is not valid format"], result["errors"])
+
+if __name__ == '__main__':
+    unittest.main()
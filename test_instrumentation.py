@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from batch import validate_file
+from instrumentation import Instrumentation
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_record_and_merge(self):
+        first = Instrumentation(slowest=2)
+        first.record("validate", 0.5)
+        first.record("validate", 1.5)
+        first.count("policies", 2)
+        first.record_file("a.json", 0.1)
+        first.record_file("b.json", 0.3)
+        first.record_file("c.json", 0.2)
+
+        second = Instrumentation()
+        second.merge(first.to_dict())
+        self.assertEqual({"count": 2, "seconds": 2.0, "max_seconds": 1.5}, second.to_dict()["timers"]["validate"])
+        self.assertEqual({"policies": 2}, second.to_dict()["counters"])
+        self.assertEqual([["b.json", 0.3], ["c.json", 0.2]], second.to_dict()["slowest_files"])
+
+    def test_prometheus_output(self):
+        instrumentation = Instrumentation()
+        instrumentation.record("rule.sid", 0.25)
+        instrumentation.count("policies")
+        text = instrumentation.to_prometheus()
+        self.assertIn('policy_validation_seconds_total{phase="rule.sid"} 0.250000000', text)
+        self.assertIn('policy_validation_events_total{event="policies"} 1', text)
+
+    def test_write_json(self):
+        instrumentation = Instrumentation()
+        instrumentation.record("load", 0.1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            instrumentation.write(path)
+            with open(path, 'r', encoding='UTF-8') as file:
+                self.assertEqual(1, json.load(file)["timers"]["load"]["count"])
+
+    def test_validation_phases_and_rules_are_timed(self):
+        obj = VeryfingIfValidJSON("Test/correctJsonFormat.json")
+        obj.instrumentation = Instrumentation()
+        obj.loading_file()
+        obj.validate()
+        timers = obj.instrumentation.to_dict()["timers"]
+        for name in ("load", "parse", "validate", "rule.sid", "rule.effect", "rule.action", "rule.resource"):
+            self.assertIn(name, timers)
+
+    def test_validate_file_metrics_only_when_instrumented(self):
+        self.assertNotIn("metrics", validate_file("Test/correctJsonFormat.json"))
+        metrics = validate_file("Test/correctJsonFormat.json", instrument=True)["metrics"]
+        self.assertEqual("Test/correctJsonFormat.json", metrics["slowest_files"][0][0])
+
+if __name__ == '__main__':
+    unittest.main()
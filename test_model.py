@@ -0,0 +1,46 @@
+import unittest
+from model import PolicyCorpus, StringTable
+from policy_fixtures import policy
+
+class TestModel(unittest.TestCase):
+
+    def test_string_table_interns(self):
+        table = StringTable()
+        first = "".join(["s3:", "GetObject"])
+        second = "".join(["s3:", "GetObject"])
+        self.assertIsNot(first, second)
+        self.assertIs(table.intern(first), table.intern(second))
+        self.assertEqual(0, table.id(None))
+        self.assertEqual(1, len(table))
+
+    def test_statements_round_trip(self):
+        corpus = PolicyCorpus()
+        index = corpus.add_policy("a.json", policy(
+            {"Sid": "Read", "Effect": "Allow", "Action": "s3:GetObject", "Resource": ["arn:aws:s3:::b/*", 5]},
+            {"Effect": "Deny", "NotAction": ["iam:*"], "NotResource": "*", "Condition": {"Bool": {"aws:MultiFactorAuthPresent": "false"}}},
+            "not a statement"))
+        self.assertEqual(0, index)
+        first, second, third = corpus.statements(index)
+        self.assertEqual(("Read", "Allow", ["s3:GetObject"], None, ["arn:aws:s3:::b/*"], None, None),
+                         (first.sid, first.effect, first.actions, first.not_actions, first.resources,
+                          first.not_resources, first.condition))
+        self.assertEqual((None, ["iam:*"], None, ["*"]),
+                         (second.actions, second.not_actions, second.resources, second.not_resources))
+        self.assertEqual('{"Bool": {"aws:MultiFactorAuthPresent": "false"}}', second.condition)
+        self.assertFalse(third.is_object)
+        self.assertEqual("2012-10-17", corpus.version(index))
+
+    def test_repeated_strings_are_stored_once(self):
+        corpus = PolicyCorpus()
+        for number in range(100):
+            corpus.add_policy(f"policy{number}.json", policy(
+                {"Effect": "Allow", "Action": ["s3:GetObject", "s3:PutObject"], "Resource": "arn:aws:s3:::bucket/*"}))
+        self.assertIsNone(corpus.add_policy("broken.json", {"PolicyName": "root"}))
+        self.assertEqual((100, 100), (len(corpus), corpus.statement_count))
+        # 100 names, Allow, 2012-10-17, two actions and one resource
+        self.assertEqual(105, len(corpus.strings))
+        self.assertIs(corpus.statements(0)[0].actions[0], corpus.statements(99)[0].actions[0])
+        self.assertLess(corpus.nbytes(), 100 * 64)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from policy_fixtures import READ_STATEMENT, policy
+from profiles import RuleProfile, load_profile, load_profiles
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestProfiles(unittest.TestCase):
+
+    def test_shipped_profiles_are_loaded_once(self):
+        default, profiles = load_profiles()
+        self.assertEqual("prod", default)
+        self.assertEqual({"dev", "prod", "strict"}, set(profiles))
+        self.assertIs(load_profile(), load_profile("prod"))
+        self.assertIs(load_profiles(), load_profiles())
+        with self.assertRaises(Exception) as context:
+            load_profile("missing")
+        self.assertEqual("Unknown rule profile missing, available: dev, prod, strict", str(context.exception))
+
+    def test_extends_and_defaults(self):
+        dev = load_profile("dev")
+        self.assertEqual(128, dev.policy_name_max_length)
+        self.assertTrue(dev.valid_sid("Read bucket"))
+        profile = RuleProfile("empty", {})
+        self.assertTrue(profile.valid_policy_name("a" * 128))
+        self.assertFalse(profile.valid_policy_name("a" * 129))
+        self.assertFalse(profile.valid_sid("a-b"))
+        with self.assertRaises(Exception):
+            RuleProfile("broken", {"wildcard_resource": "warn"})
+
+    def test_profiles_change_validation(self):
+        wildcard = VeryfingIfValidJSON.from_data(policy({**READ_STATEMENT, "Sid": "All", "Resource": "*"}))
+        self.assertIs(False, wildcard.validate().resource)
+        self.assertIs(True, wildcard.validate(profile="dev").resource)
+        self.assertEqual(["Resource must not be a global or service-wide wildcard"], wildcard.validate(profile="strict").errors)
+        guardrail = VeryfingIfValidJSON.from_data(policy({**READ_STATEMENT, "Sid": "Read"}, {
+            "Sid": "Region", "Effect": "Deny", "Action": "*", "Resource": "*",
+            "Condition": {"StringNotEquals": {"aws:RequestedRegion": "eu-west-1"}}}))
+        self.assertEqual([], guardrail.validate(profile="strict").errors)
+
+        self.assertEqual(["Sid is required in Statement"], VeryfingIfValidJSON.from_data(policy(READ_STATEMENT)).validate(profile="strict").errors)
+        self.assertEqual(["PolicyName is not string or it requirements not met"],
+                         VeryfingIfValidJSON.from_data(policy({**READ_STATEMENT, "Sid": "Read"}, name="ab")).validate(profile="strict").errors)
+        self.assertTrue(VeryfingIfValidJSON.from_data(policy({**READ_STATEMENT, "Sid": "read.bucket"})).validate(profile="dev").valid)
+
+    def test_legacy_checks_use_profile(self):
+        verifier = VeryfingIfValidJSON("Test/resourceInput1.json")
+        verifier.loading_file()
+        self.assertEqual(False, verifier.check_validate_resource())
+        verifier.profile = "dev"
+        self.assertEqual(True, verifier.check_validate_resource())
+        verifier.profile = load_profile("strict")
+        with self.assertRaises(Exception):
+            verifier.check_validate_resource()
+
+    def test_custom_config_file(self):
+        config = {"default_profile": "team", "profiles": {"team": {"sid": {"pattern": "[a-z]+", "message": "lower case Sid"}}}}
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as file:
+            json.dump(config, file)
+        try:
+            result = VeryfingIfValidJSON.from_data(policy({**READ_STATEMENT, "Sid": "Read"})).validate(config=file.name)
+        finally:
+            os.remove(file.name)
+        self.assertEqual(["lower case Sid"], result.errors)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import xml.etree.ElementTree as ElementTree
+from batch import validate_file
+from reporting import Diagnostic, json_pointer, junit_report, sarif_report
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestReporting(unittest.TestCase):
+
+    def test_json_pointer_escaping(self):
+        self.assertEqual("/PolicyDocument/Statement/0/Sid", json_pointer("PolicyDocument", "Statement", 0, "Sid"))
+        self.assertEqual("/a~1b/c~0d", json_pointer("a/b", "c~d"))
+
+    def test_diagnostics_point_at_statement_fields(self):
+        result = VeryfingIfValidJSON("Test/multipleErrors.json")
+        result.loading_file()
+        diagnostics = result.validate().diagnostics
+        self.assertEqual([("sid", "/PolicyDocument/Statement/1/Sid"), ("effect", "/PolicyDocument/Statement/1/Effect"),
+                          ("action", "/PolicyDocument/Statement/1/Action")],
+                         [(diagnostic.rule, diagnostic.path) for diagnostic in diagnostics])
+        self.assertEqual([diagnostic.message for diagnostic in diagnostics], result.validate().errors)
+
+    def test_single_statement_object_and_document_paths(self):
+        data = {"PolicyName": "root", "PolicyDocument": {"Version": "2012-10-17",
+                                                         "Statement": {"Sid": "a b", "Effect": "Allow", "Action": "*", "Resource": "*"}}}
+        diagnostics = VeryfingIfValidJSON.from_data(data).validate().diagnostics
+        self.assertEqual(["/PolicyDocument/Statement/Sid"], [diagnostic.path for diagnostic in diagnostics])
+        diagnostics = VeryfingIfValidJSON.from_data({"PolicyName": "root"}).validate().diagnostics
+        self.assertEqual([("policy_document", "")], [(diagnostic.rule, diagnostic.path) for diagnostic in diagnostics])
+
+    def test_warnings_do_not_invalidate(self):
+        result = validate_file("Test/actionCatalogPolicy.json", {"action_catalog": "actions.json"})
+        warnings = [diagnostic for diagnostic in result["diagnostics"] if diagnostic["severity"] == "warning"]
+        self.assertEqual(result["warnings"], [diagnostic["message"] for diagnostic in warnings])
+        self.assertEqual(Diagnostic("load", "error", "", "File loading error").to_dict(),
+                         validate_file("non_existent_file.json")["diagnostics"][0])
+
+    def test_sarif_and_junit_reports(self):
+        results = [validate_file("Test/multipleErrors.json"), validate_file("Test/correctJsonFormat.json")]
+        sarif = sarif_report(results)
+        self.assertEqual("2.1.0", sarif["version"])
+        self.assertEqual(["action", "effect", "sid"], [rule["id"] for rule in sarif["runs"][0]["tool"]["driver"]["rules"]])
+        location = sarif["runs"][0]["results"][0]["locations"][0]
+        self.assertEqual("Test/multipleErrors.json", location["physicalLocation"]["artifactLocation"]["uri"])
+        self.assertEqual("/PolicyDocument/Statement/1/Sid", location["logicalLocations"][0]["fullyQualifiedName"])
+
+        suites = ElementTree.fromstring(junit_report(results))
+        self.assertEqual(("2", "1"), (suites.get("tests"), suites.get("failures")))
+        cases = suites.findall("./testsuite/testcase")
+        self.assertEqual("sid", cases[0].find("failure").get("type"))
+        self.assertIsNone(cases[1].find("failure"))
+
+if __name__ == '__main__':
+    unittest.main()
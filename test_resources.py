@@ -0,0 +1,61 @@
+import unittest
+from resources import (Arn, GLOBAL, INVALID, NONE, RESOURCE, SERVICE, PatternIndex, ResourcePatterns,
+                       parse_arn, statement_breadth, wildcard_breadth)
+from VeryfingIfValidJSON import VeryfingIfValidJSON
+
+class TestResources(unittest.TestCase):
+
+    def test_parse_arn(self):
+        self.assertEqual(Arn("aws", "s3", "", "", "bucket/key:with:colons"), parse_arn("arn:aws:s3:::bucket/key:with:colons"))
+        self.assertIsNone(parse_arn("*"))
+        self.assertIsNone(parse_arn("arn:aws:s3"))
+
+    def test_wildcard_breadth(self):
+        self.assertEqual(GLOBAL, wildcard_breadth("*"))
+        self.assertEqual(GLOBAL, wildcard_breadth("arn:aws:*:*:*:*"))
+        self.assertEqual(SERVICE, wildcard_breadth("arn:aws:s3:::*"))
+        self.assertEqual(SERVICE, wildcard_breadth("arn:aws:iam::*:*"))
+        self.assertEqual(RESOURCE, wildcard_breadth("arn:aws:s3:::bucket/*"))
+        self.assertEqual(NONE, wildcard_breadth("arn:aws:s3:::bucket"))
+        self.assertEqual(INVALID, wildcard_breadth("**"))
+
+    def test_statement_breadth(self):
+        self.assertEqual(SERVICE, statement_breadth("Allow", ["arn:aws:s3:::bucket", "arn:aws:s3:::*"], None))
+        self.assertEqual(GLOBAL, statement_breadth("Allow", None, ["arn:aws:s3:::bucket"]))
+        self.assertEqual(NONE, statement_breadth("Deny", None, ["arn:aws:s3:::bucket"]))
+        self.assertEqual(NONE, statement_breadth("Deny", ["*", "arn:aws:s3:::*"], None))
+
+    def test_pattern_index(self):
+        index = PatternIndex(["arn:aws:s3:::exact", "arn:aws:s3:::logs-*", "arn:aws:s3:::log?", "*-archive"])
+        self.assertEqual("arn:aws:s3:::exact", index.match("arn:aws:s3:::exact"))
+        self.assertEqual("arn:aws:s3:::logs-*", index.match("arn:aws:s3:::logs-2024/file"))
+        self.assertEqual("arn:aws:s3:::log?", index.match("arn:aws:s3:::logs"))
+        self.assertEqual("*-archive", index.match("arn:aws:s3:::old-archive"))
+        self.assertIsNone(index.match("arn:aws:s3:::other"))
+        self.assertEqual(4, len(index))
+
+    def test_resource_patterns(self):
+        patterns = ResourcePatterns(allow=["arn:aws:s3:::team-*"], deny=["arn:aws:s3:::team-secrets*"])
+        self.assertIsNone(patterns.check("arn:aws:s3:::team-logs"))
+        self.assertEqual("Resource arn:aws:s3:::team-secrets matches denied pattern arn:aws:s3:::team-secrets*",
+                         patterns.check("arn:aws:s3:::team-secrets"))
+        self.assertEqual("Resource arn:aws:s3:::other does not match any allowed pattern",
+                         patterns.check("arn:aws:s3:::other"))
+
+    def test_validate_with_resource_patterns_file(self):
+        obj = VeryfingIfValidJSON("Test/resourcePatternsPolicy.json")
+        obj.loading_file()
+        self.assertTrue(obj.validate().valid)
+        result = obj.validate(resource_patterns="Test/resourcePatterns.json")
+        self.assertEqual([
+            "Resource arn:aws:s3:::team-secrets/key matches denied pattern arn:aws:s3:::team-secrets*",
+            "Resource arn:aws:s3:::other-bucket does not match any allowed pattern",
+        ], result.errors)
+
+    def test_service_wildcard_resource(self):
+        policy = {"PolicyName": "root", "PolicyDocument": {"Version": "2012-10-17", "Statement": {
+            "Effect": "Allow", "Action": "s3:*", "Resource": "arn:aws:s3:::*"}}}
+        self.assertEqual(False, VeryfingIfValidJSON.from_data(policy).validate().resource)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+from reporting import WARNING
+from rules import RuleContext, RuleRegistry, concurrent_executor
+from VeryfingIfValidJSON import RULES, ValidationResult, VeryfingIfValidJSON
+
+class TestRules(unittest.TestCase):
+
+    def test_builtin_plan_order(self):
+        order = RULES.plan().order
+        self.assertEqual("policy_document", order[0])
+        for rule in ("sid", "effect", "action", "resource"):
+            self.assertLess(order.index("statement"), order.index(rule))
+        self.assertIs(RULES.plan(), RULES.plan())
+
+    def test_dependent_rules_are_skipped_and_run_once(self):
+        calls = []
+        registry = RuleRegistry()
+        registry.register("first", lambda context: calls.append("first") or [(None, "first failed")])
+        registry.register("second", lambda context: calls.append("second") or [], depends_on=("first",))
+        registry.register("third", lambda context: calls.append("third") or [], depends_on=("second",))
+        registry.register("independent", lambda context: calls.append("independent") or [])
+
+        result = registry.plan().run(RuleContext({}, ValidationResult()))
+        self.assertEqual(["first", "independent"], calls)
+        self.assertEqual(["first failed"], result.errors)
+
+    def test_cycle_and_unknown_dependency(self):
+        registry = RuleRegistry()
+        registry.register("a", lambda context: [], depends_on=("b",))
+        registry.register("b", lambda context: [], depends_on=("a",))
+        with self.assertRaises(Exception):
+            registry.plan()
+
+        registry = RuleRegistry()
+        registry.register("a", lambda context: [], depends_on=("missing",))
+        with self.assertRaises(Exception) as context:
+            registry.plan()
+        self.assertEqual("Rule a depends on unknown rule missing", str(context.exception))
+
+    def test_registry_without_rules(self):
+        registry = RULES.without("resource")
+        self.assertNotIn("resource", registry.plan().order)
+        self.assertIn("resource", RULES.plan().order)
+        with self.assertRaises(Exception):
+            RULES.without("statement").plan()
+
+    def test_org_specific_rule(self):
+        registry = RULES.copy()
+
+        @registry.rule("require_sid", depends_on=("statement",), reads=("Sid",))
+        def require_sid(context):
+            return [(index, "Sid is required") for index, sid in enumerate(context.columns.sids) if sid is None]
+
+        obj = VeryfingIfValidJSON("Test/singleStatementObject.json")
+        obj.loading_file()
+        self.assertTrue(obj.validate(rules=registry).valid)
+        obj.json_data["PolicyDocument"]["Statement"].pop("Sid")
+        self.assertEqual(["Sid is required"], obj.validate(rules=registry).errors)
+        self.assertTrue(obj.validate().valid)
+
+    def test_concurrent_execution_keeps_order(self):
+        obj = VeryfingIfValidJSON("Test/multipleErrors.json")
+        obj.loading_file()
+        with concurrent_executor(4) as executor:
+            concurrent = obj.validate(executor=executor)
+        self.assertEqual(obj.validate().errors, concurrent.errors)
+
+    def test_warnings_are_added_in_plan_order(self):
+        registry = RuleRegistry()
+        registry.register("slow", lambda context: time.sleep(0.05) or [(None, "slow warning", WARNING)], path="/slow")
+        registry.register("fast", lambda context: [(None, "fast warning", WARNING), (None, "fast error")], path="/fast")
+        with concurrent_executor(2) as executor:
+            result = registry.plan().run(RuleContext({}, ValidationResult()), executor)
+        self.assertEqual(["slow warning", "fast warning"], result.warnings)
+        self.assertEqual(["slow", "fast", "fast"], [diagnostic.rule for diagnostic in result.diagnostics])
+        self.assertEqual(["fast error"], result.errors)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+from server import ValidationServer
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = ValidationServer(workers=1)
+        ready = asyncio.get_running_loop().create_future()
+        self.task = asyncio.create_task(self.server.serve("127.0.0.1", 0, ready.set_result))
+        self.address = await ready
+
+    async def asyncTearDown(self):
+        self.task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await self.task
+
+    async def request(self, reader, writer, method, path, body=b'', length=None):
+        length = len(body) if length is None else length
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b'\r\n':
+            name, _, value = line.decode().partition(':')
+            headers[name.lower()] = value.strip()
+        return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+    async def test_validate_single_and_batch_on_one_connection(self):
+        with open("Test/correctJsonFormat.json", 'rb') as file:
+            policy = file.read()
+        with open("Test/missingAction.json", 'rb') as file:
+            invalid = file.read()
+
+        reader, writer = await asyncio.open_connection(*self.address)
+        status, result = await self.request(reader, writer, "POST", "/validate", policy)
+        self.assertEqual(200, status)
+        self.assertEqual({"valid": True, "resource": False, "errors": [], "warnings": [], "diagnostics": []}, result)
+
+        status, results = await self.request(reader, writer, "POST", "/validate", b"[" + policy + b"," + invalid + b"," + policy + b"]")
+        self.assertEqual([True, False, True], [result["valid"] for result in results])
+
+        status, metrics = await self.request(reader, writer, "GET", "/metrics")
+        self.assertEqual(4, metrics["policies"])
+        self.assertEqual(1, metrics["invalid_policies"])
+        writer.close()
+
+    async def test_health_and_errors(self):
+        reader, writer = await asyncio.open_connection(*self.address)
+        self.assertEqual((200, {"status": "ok"}), await self.request(reader, writer, "GET", "/health"))
+        self.assertEqual(400, (await self.request(reader, writer, "POST", "/validate", b"{bad"))[0])
+        self.assertEqual(404, (await self.request(reader, writer, "GET", "/unknown"))[0])
+        writer.close()
+
+        for length in ("abc", "-5"):
+            reader, writer = await asyncio.open_connection(*self.address)
+            self.assertEqual((400, {"error": "Content-Length must be a non-negative integer"}),
+                             await self.request(reader, writer, "POST", "/validate", b"{}", length))
+            self.assertEqual(b'', await reader.read())
+            writer.close()
+
+    async def test_deeply_nested_body(self):
+        reader, writer = await asyncio.open_connection(*self.address)
+        self.assertEqual((400, {"error": "JSON is not valid format"}),
+                         await self.request(reader, writer, "POST", "/validate", b"[" * 100000))
+        writer.close()
+
+    async def test_unexpected_errors_answer_500(self):
+        reader, writer = await asyncio.open_connection(*self.address)
+        writer.write(b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 100000 + b"\r\n\r\n")
+        self.assertEqual(500, int((await reader.readline()).split()[1]))
+        writer.close()
+
+        with open("Test/correctJsonFormat.json", 'rb') as file:
+            policy = file.read()
+        self.server.options = {"resource_patterns": "Test/missingPatterns.json"}
+        reader, writer = await asyncio.open_connection(*self.address)
+        status, response = await self.request(reader, writer, "POST", "/validate", policy)
+        self.assertEqual(500, status)
+        self.assertIn("missingPatterns.json", response["error"])
+        self.assertEqual(b'', await reader.read())
+        writer.close()
+
+        self.server.options = None
+        reader, writer = await asyncio.open_connection(*self.address)
+        status, metrics = await self.request(reader, writer, "GET", "/metrics")
+        self.assertEqual(2, metrics["server_errors"])
+        self.assertEqual(2, metrics["requests"])
+        writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import json
+import unittest
+from simulator import ALLOWED, CONDITIONAL, EXPLICIT_DENY, IMPLICIT_DENY, PolicySimulator, load_simulator
+from policy_fixtures import policy
+
+class TestSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.simulator = PolicySimulator()
+        self.simulator.add_policy("read", policy(
+            {"Effect": "Allow", "Action": "s3:Get*", "Resource": "arn:aws:s3:::bucket/*"},
+            {"Effect": "Allow", "NotAction": "iam:*", "Resource": "arn:aws:sqs:*:123456789012:*"}))
+        self.simulator.add_policy("guard", policy(
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/secret*"},
+            {"Effect": "Deny", "Action": "sqs:DeleteQueue", "NotResource": "arn:aws:sqs:*:123456789012:temp-*"},
+            {"Effect": "Allow", "Action": "*", "Resource": "*", "Condition": {"Bool": {"aws:MultiFactorAuthPresent": "true"}}}))
+
+    def test_allow(self):
+        self.assertEqual((ALLOWED, ("read", 0)), self.simulator.evaluate("s3:GetObject", "arn:aws:s3:::bucket/key"))
+        self.assertEqual((ALLOWED, ("read", 0)), self.simulator.evaluate("S3:getobjectacl", "arn:aws:s3:::bucket/key"))
+        self.assertEqual(1, self.simulator.conditional)
+
+    def test_conditional_statements(self):
+        # The conditional Allow of 'guard' may allow a request no other statement allows
+        self.assertEqual((CONDITIONAL, ("guard", 2)), self.simulator.evaluate("s3:PutObject", "arn:aws:s3:::bucket/key"))
+
+        simulator = PolicySimulator()
+        simulator.add_policy("allow", policy({"Effect": "Allow", "Action": "s3:*", "Resource": "*"}))
+        simulator.add_policy("deny", policy({"Effect": "Deny", "Action": "s3:*", "Resource": "*",
+                                             "Condition": {"Bool": {"aws:SecureTransport": "false"}}}))
+        self.assertEqual((CONDITIONAL, ("deny", 0)), simulator.evaluate("s3:GetObject", "arn:aws:s3:::bucket/key"))
+        self.assertEqual((IMPLICIT_DENY, None), simulator.evaluate("sqs:SendMessage", "arn:aws:sqs:eu-west-1:123456789012:queue"))
+
+    def test_explicit_deny_overrides_allow(self):
+        self.assertEqual((EXPLICIT_DENY, ("guard", 0)),
+                         self.simulator.evaluate("s3:GetObject", "arn:aws:s3:::bucket/secret.txt"))
+
+    def test_not_action_and_not_resource(self):
+        queue = "arn:aws:sqs:eu-west-1:123456789012:orders"
+        self.assertEqual((ALLOWED, ("read", 1)), self.simulator.evaluate("sqs:SendMessage", queue))
+        self.assertEqual((CONDITIONAL, ("guard", 2)), self.simulator.evaluate("iam:ListRoles", queue))
+        self.assertEqual((EXPLICIT_DENY, ("guard", 1)), self.simulator.evaluate("sqs:DeleteQueue", queue))
+        self.assertEqual((ALLOWED, ("read", 1)),
+                         self.simulator.evaluate("sqs:DeleteQueue", "arn:aws:sqs:eu-west-1:123456789012:temp-1"))
+
+    def test_bulk_jsonl_requests(self):
+        simulator = load_simulator(["Test/singleStatementObject.json", "Test/resourceInList.json"])
+        output = io.StringIO()
+        with open("Test/simulatorRequests.jsonl", 'r', encoding='UTF-8') as file:
+            simulator.evaluate_jsonl(file, output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([ALLOWED, EXPLICIT_DENY, ALLOWED, IMPLICIT_DENY], [result["decision"] for result in results[:4]])
+        self.assertIn("error", results[4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import io
+import json
+import unittest
+from streaming import read_jsonl, validate_stream
+
+class TestStreaming(unittest.TestCase):
+
+    def test_read_jsonl_skips_empty_lines(self):
+        with open("Test/policies.jsonl", 'r', encoding='UTF-8') as file:
+            lines = [line_number for line_number, record, error in read_jsonl(file)]
+        self.assertEqual([1, 3, 4, 5], lines)
+
+    def test_validate_stream_writes_one_result_per_record(self):
+        output = io.StringIO()
+        with open("Test/policies.jsonl", 'r', encoding='UTF-8') as file:
+            failed = validate_stream(file, output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+        self.assertEqual(2, failed)
+        self.assertEqual([1, 3, 4, 5], [result["line"] for result in results])
+        self.assertEqual(False, results[0]["resource"])
+        self.assertEqual(True, results[1]["resource"])
+        self.assertEqual(["JSON is not valid format"], results[2]["errors"])
+        self.assertEqual(["Statement not in Policy Document"], results[3]["errors"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
+import json
 import unittest
+from unittest import mock
+import VeryfingIfValidJSON as module
 from VeryfingIfValidJSON import VeryfingIfValidJSON
 
 class TestVeryfingJSON(unittest.TestCase):
@@ -295,5 +298,133 @@ class TestVeryfingJSON(unittest.TestCase):
             self.fail(f"Unexpected exception raised: {e}")
         self.assertEqual(True, result)
 
+    def test_validate_correct_file(self):
+        path = "Test/correctJsonFormat.json"
+        obj = VeryfingIfValidJSON(path)
+        obj.loading_file()
+        result = obj.validate()
+        self.assertEqual([], result.errors)
+        self.assertTrue(result.valid)
+        self.assertEqual(False, result.resource)
+
+    def test_validate_collects_all_errors(self):
+        path = "Test/multipleErrors.json"
+        obj = VeryfingIfValidJSON(path)
+        obj.loading_file()
+        result = obj.validate()
+        self.assertFalse(result.valid)
+        self.assertEqual([
+            'Invalid SID: The Sid element supports ASCII uppercase letters (A-Z), lowercase letters (a-z), and numbers (0-9)',
+            "Valid values for Effect are only: Allow and Deny",
+            "Action or NotAction must be included in Statement",
+        ], result.errors)
+
+    def test_validate_missing_policy_document(self):
+        path = "Test/missingPolicyDocument.json"
+        obj = VeryfingIfValidJSON(path)
+        obj.loading_file()
+        result = obj.validate()
+        self.assertEqual(["PolicyName or PolicyDocument not found in JSON"], result.errors)
+
+    def test_main_returns_resource_result(self):
+        self.assertEqual(False, VeryfingIfValidJSON("Test/resourceInput1.json").main())
+        self.assertEqual(True, VeryfingIfValidJSON("Test/resourceInput3.json").main())
+
+    def test_checking_effect_in_every_statement(self):
+        path = "Test/multipleErrors.json"
+        obj = VeryfingIfValidJSON(path)
+
+        with self.assertRaises(Exception) as context:
+            obj.loading_file()
+            obj.check_validate_effect()
+        self.assertEqual(str(context.exception), "Valid values for Effect are only: Allow and Deny")
+
+    def test_checking_action_in_every_statement(self):
+        path = "Test/multipleErrors.json"
+        obj = VeryfingIfValidJSON(path)
+
+        with self.assertRaises(Exception) as context:
+            obj.loading_file()
+            obj.check_validate_action()
+        self.assertEqual(str(context.exception), "Action or NotAction must be included in Statement")
+
+    def test_checking_single_statement_object(self):
+        path = "Test/singleStatementObject.json"
+        obj = VeryfingIfValidJSON(path)
+        try:
+            obj.loading_file()
+            obj.check_validate_sid()
+            obj.check_validate_effect()
+            obj.check_validate_action()
+            result = obj.check_validate_resource()
+        except Exception as e:
+            self.fail(f"Unexpected exception raised: {e}")
+        self.assertEqual(True, result)
+
+    def test_checking_resource_in_list_of_statements(self):
+        path = "Test/resourceInList.json"
+        obj = VeryfingIfValidJSON(path)
+        obj.loading_file()
+        self.assertEqual(False, obj.check_validate_resource())
+        self.assertEqual(False, obj.main())
+
+    def test_statement_columns(self):
+        obj = VeryfingIfValidJSON("Test/resourceInList.json")
+        obj.loading_file()
+        columns = obj.statement_columns()
+        self.assertEqual(2, len(columns))
+        self.assertEqual(["Allow", "Allow"], columns.effects)
+        self.assertEqual([["iam:ListRoles", "iam:ListUsers"], ["s3:GetObject"]], columns.actions)
+        self.assertEqual([None, None], columns.not_resources)
+
+    def test_validate_from_data(self):
+        with open("Test/correctJsonFormat.json", 'r', encoding='UTF-8') as file:
+            data = json.load(file)
+        result = VeryfingIfValidJSON.from_data(data).validate()
+        self.assertTrue(result.valid)
+        self.assertEqual(False, result.resource)
+
+    def test_validate_from_bytes_and_memoryview(self):
+        with open("Test/resourceInput3.json", 'rb') as file:
+            buffer = file.read()
+        for decoder in (module.orjson, None):
+            with mock.patch.object(module, "orjson", decoder):
+                self.assertEqual(True, VeryfingIfValidJSON.from_bytes(buffer).validate().resource)
+                self.assertEqual(True, VeryfingIfValidJSON.from_bytes(memoryview(buffer)).validate().resource)
+
+    def test_from_bytes_wrong_JSON_format(self):
+        with self.assertRaises(Exception) as context:
+            VeryfingIfValidJSON.from_bytes(b'"PolicyName": "root"')
+        self.assertEqual(str(context.exception), "JSON is not valid format")
+
+    def test_validate_from_mmap(self):
+        for decoder in (module.orjson, None):
+            with mock.patch.object(module, "orjson", decoder):
+                result = VeryfingIfValidJSON.from_mmap("Test/missingAction.json").validate()
+                self.assertEqual(["Action or NotAction must be included in Statement"], result.errors)
+
+        with self.assertRaises(Exception) as context:
+            VeryfingIfValidJSON.from_mmap("non_existent_file.json")
+        self.assertEqual(str(context.exception), "File loading error")
+
+    def test_mmap_is_passed_to_orjson_as_memoryview(self):
+        buffers = []
+
+        def loads(buffer):
+            buffers.append(type(buffer))
+            return json.loads(bytes(buffer))
+
+        with mock.patch.object(module, "orjson", mock.Mock(loads=loads)):
+            result = VeryfingIfValidJSON.from_mmap("Test/missingAction.json").validate()
+        self.assertEqual([memoryview], buffers)
+        self.assertEqual(["Action or NotAction must be included in Statement"], result.errors)
+
+    @unittest.skipUnless(module.orjson, "orjson is not installed")
+    def test_validate_from_mmap_with_orjson(self):
+        with mock.patch.object(module.orjson, "loads", wraps=module.orjson.loads) as loads:
+            result = VeryfingIfValidJSON.from_mmap("Test/resourceInput3.json").validate()
+        self.assertIsInstance(loads.call_args.args[0], memoryview)
+        self.assertEqual(True, result.resource)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
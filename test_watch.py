@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+from watch import InotifyWatcher, PollingWatcher, WatchedPaths, WatchSession, debounced
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.policy = os.path.join(self.directory, "policy.json")
+        shutil.copy("Test/correctJsonFormat.json", self.policy)
+        self.watched = WatchedPaths([self.directory])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_watched_paths(self):
+        self.assertIn(self.policy, self.watched)
+        self.assertNotIn(os.path.join(self.directory, "notes.txt"), self.watched)
+        self.assertIn("Test/resourceInput1.json", WatchedPaths(["Test/resourceInput*.json"]))
+        self.assertEqual([self.directory], self.watched.roots())
+
+    def test_watched_current_directory(self):
+        current = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            watched = WatchedPaths([os.curdir])
+            self.assertIn("policy.json", watched)
+            self.assertIn(os.path.join("nested", "policy.json"), watched)
+            self.assertNotIn("notes.txt", watched)
+            self.assertEqual([os.curdir], watched.roots())
+        finally:
+            os.chdir(current)
+
+    def test_session_revalidates_only_changed_content(self):
+        session = WatchSession()
+        self.assertEqual([True], [result["valid"] for path, result in session.refresh([self.policy])])
+        self.assertEqual([], session.refresh([self.policy]))
+
+        shutil.copy("Test/missingAction.json", self.policy)
+        updates = session.refresh([self.policy])
+        self.assertEqual([False], [result["valid"] for path, result in updates])
+        self.assertEqual(1, session.failed)
+
+        os.remove(self.policy)
+        self.assertEqual([(self.policy, None)], session.refresh([self.policy]))
+        self.assertEqual({}, session.results)
+
+    def test_polling_watcher_detects_changes(self):
+        watcher = PollingWatcher(self.watched, interval=0.01)
+        self.assertEqual(set(), watcher.wait(0.02))
+        created = os.path.join(self.directory, "created.json")
+        shutil.copy(self.policy, created)
+        os.remove(self.policy)
+        self.assertEqual({created, self.policy}, watcher.wait(1))
+
+    def test_inotify_watcher_debounces_saves(self):
+        try:
+            watcher = InotifyWatcher(self.watched)
+        except (OSError, AttributeError):
+            self.skipTest("inotify is not available")
+        try:
+            subdirectory = os.path.join(self.directory, "nested")
+            os.mkdir(subdirectory)
+            nested = os.path.join(subdirectory, "nested.json")
+            for _ in range(3):
+                shutil.copy("Test/correctJsonFormat.json", self.policy)
+            shutil.copy("Test/correctJsonFormat.json", nested)
+            changed = next(debounced(watcher, debounce=0.05))
+            if nested not in changed:
+                changed |= next(debounced(watcher, debounce=0.05))
+            self.assertEqual({self.policy, nested}, changed)
+        finally:
+            watcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,273 @@
+import ctypes
+import fnmatch
+import glob
+import os
+import select
+import struct
+import sys
+import time
+
+from batch import collect_policy_files, format_result, validate_file
+from cache import file_key, options_key
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class WatchedPaths:
+    """
+        The policy files selected by the command line paths: every '*.json' file below a directory,
+        files matching a glob pattern and plain file paths, including files created after startup.
+    """
+
+    def __init__(self, paths) -> None:
+        self.paths = list(paths)
+        self.directories = [os.path.normpath(path) for path in self.paths if os.path.isdir(path)]
+        self.patterns = [os.path.normpath(path) for path in self.paths if not os.path.isdir(path) and glob.has_magic(path)]
+        self.files = {os.path.normpath(path) for path in self.paths if not os.path.isdir(path) and not glob.has_magic(path)}
+        # Candidates are matched as absolute paths: normpath('./p.json') is 'p.json', which a watched '.' would miss
+        self._directories = [os.path.join(os.path.abspath(directory), '') for directory in self.directories]
+        self._patterns = [os.path.abspath(pattern) for pattern in self.patterns]
+        self._files = {os.path.abspath(path) for path in self.files}
+
+    def __contains__(self, path):
+        path = os.path.abspath(path)
+        return (path in self._files
+                or (path.endswith('.json') and any(path.startswith(directory) for directory in self._directories))
+                or any(fnmatch.fnmatch(path, pattern) for pattern in self._patterns))
+
+    def roots(self):
+        """
+            Directories to monitor: watched directories, the directory of each file and the
+            directory part of each pattern before its first wildcard.
+        """
+        roots = set(self.directories)
+        roots.update(os.path.dirname(path) or os.curdir for path in self.files)
+        for pattern in self.patterns:
+            prefix = []
+            for part in pattern.split(os.sep):
+                if glob.has_magic(part):
+                    break
+                prefix.append(part)
+            roots.add(os.sep.join(prefix) or os.curdir)
+        return sorted(root for root in roots if os.path.isdir(root))
+
+    def collect(self):
+        return [os.path.normpath(path) for path in collect_policy_files(self.paths) if os.path.isfile(path)]
+
+
+class PollingWatcher:
+    """
+        Portable watcher comparing (mtime, size) of the watched files every 'interval' seconds.
+    """
+
+    def __init__(self, watched, interval=0.5) -> None:
+        self.watched = watched
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for path in self.watched.collect():
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (status.st_mtime_ns, status.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """
+            Return the set of changed, created or deleted files, an empty set when nothing changed
+            within 'timeout' seconds (None waits until something changes).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining > 0:
+                time.sleep(remaining)
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+        Linux watcher on top of inotify(7) through ctypes: the kernel reports writes, moves and deletions
+        in the watched directory trees, so waiting costs nothing and changes are seen immediately.
+        Raises OSError (or AttributeError when libc has no inotify) on other platforms.
+    """
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, watched) -> None:
+        self.watched = watched
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        self.overflowed = False
+        for root in watched.roots():
+            self._add_tree(root)
+
+    def _add_tree(self, root):
+        for directory, subdirectories, files in os.walk(root):
+            descriptor = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if descriptor < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.directories[descriptor] = os.path.normpath(directory)
+
+    def _read_events(self):
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                descriptor, mask, cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b'\0')
+                offset += INOTIFY_EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                directory = self.directories.get(descriptor)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Watch the new directory and pick up files written before the watch existed
+                        self._add_tree(path)
+                        changed.update(os.path.normpath(file) for file in collect_policy_files([path]))
+                elif not mask & IN_CREATE:
+                    changed.add(os.path.normpath(path))
+
+    def wait(self, timeout=None):
+        """
+            Return the set of changed, created or deleted paths, an empty set when nothing changed
+            within 'timeout' seconds (None waits until something changes). After an event queue
+            overflow every watched file is returned.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            changed = self._read_events() if ready else set()
+            if self.overflowed:
+                self.overflowed = False
+                changed.update(self.watched.collect())
+            changed = {path for path in changed if path in self.watched}
+            if changed or not ready or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(watched, interval=0.5, polling=False):
+    """
+        InotifyWatcher where the platform supports it, PollingWatcher otherwise or when 'polling' is set.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(watched)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(watched, interval)
+
+
+def debounced(watcher, debounce=0.05):
+    """
+        Yield sets of changed paths, merging the bursts of events editors produce on save:
+        a set is only yielded once no further change arrived for 'debounce' seconds.
+    """
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+class WatchSession:
+    """
+        Results of all watched files kept in memory between saves. refresh() revalidates only the given
+        files and skips files whose content hash did not change (touch, save without edits). Catalogs,
+        pattern lists and the rule plan are loaded by the first validation and stay cached in this process.
+    """
+
+    def __init__(self, options=None) -> None:
+        self.options = options
+        self.salt = options_key(options)
+        self.results = {}
+
+    def refresh(self, paths):
+        """
+            Revalidate 'paths' and return (path, result) for each changed file, result is None for deleted files.
+        """
+        updates = []
+        for path in sorted(paths):
+            if not os.path.isfile(path):
+                if self.results.pop(path, None) is not None:
+                    updates.append((path, None))
+                continue
+            key = file_key(path, self.salt)
+            previous = self.results.get(path)
+            if previous is not None and key is not None and previous[0] == key:
+                continue
+            result = validate_file(path, self.options)
+            self.results[path] = (key, result)
+            updates.append((path, result))
+        return updates
+
+    @property
+    def failed(self):
+        return sum(1 for key, result in self.results.values() if not result["valid"])
+
+
+def main(paths, files_from=None, options=None, debounce=0.05, interval=0.5, polling=False):
+    """
+        Validate all watched policies once, then revalidate files as they are saved until interrupted.
+    """
+    if files_from is not None:
+        paths = list(paths) + collect_policy_files([], files_from)
+    watched = WatchedPaths(paths)
+    session = WatchSession(options)
+    watcher = create_watcher(watched, interval, polling)
+
+    def report(updates, started):
+        for path, result in updates:
+            print(f"{path}: deleted" if result is None else format_result(result))
+        print(f"Watching {len(session.results)} files with {type(watcher).__name__}: {session.failed} with errors "
+              f"({len(updates)} revalidated in {(time.perf_counter() - started) * 1000:.1f} ms)", flush=True)
+
+    started = time.perf_counter()
+    report(session.refresh(watched.collect()), started)
+    try:
+        for changed in debounced(watcher, debounce):
+            started = time.perf_counter()
+            updates = session.refresh(changed)
+            if updates:
+                report(updates, started)
+    except KeyboardInterrupt:
+        print(file=sys.stderr)
+    finally:
+        watcher.close()
+    return 1 if session.failed else 0